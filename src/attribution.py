@@ -0,0 +1,84 @@
+import numpy as np
+
+# Per-feature contributions for random forest predictions using the tree-path
+# decomposition (as in treeinterpreter): each split on a sample's path moves the class
+# probabilities from the parent node's value to the child's, and that change is credited
+# to the split feature. Averaged over the trees, bias + sum(contributions) equals
+# predict_proba exactly.
+
+class ForestExplainer:
+    def __init__(self, forest):
+        """
+        Flatten every tree's node arrays into one set of arrays so all trees can be
+        walked together with numpy, one depth level per step
+        """
+        trees = [estimator.tree_ for estimator in forest.estimators_]
+        offsets = np.cumsum([0] + [tree.node_count for tree in trees])
+        self.classes = forest.classes_
+        self.n_features = forest.n_features_in_
+        self.roots = offsets[:-1]
+        self.max_depth = max(tree.max_depth for tree in trees)
+
+        self.is_leaf = np.concatenate([tree.children_left == -1 for tree in trees])
+        self.left = np.concatenate([tree.children_left + offset for tree, offset in zip(trees, offsets)])
+        self.right = np.concatenate([tree.children_right + offset for tree, offset in zip(trees, offsets)])
+        self.feature = np.concatenate([tree.feature for tree in trees])
+        self.threshold = np.concatenate([tree.threshold for tree in trees])
+
+        # Class probabilities at every node, pre-divided by the number of trees so
+        # summing over trees gives the forest average
+        value = np.concatenate([tree.value[:, 0, :] for tree in trees])
+        value = value / value.sum(axis=1, keepdims=True)
+        self.value = value / len(trees)
+        self.bias = self.value[self.roots].sum(axis=0)
+
+    def explain(self, X):
+        """
+        Return (bias, contributions) for scaled inputs X of shape (n, n_features):
+        bias is (n_classes,), contributions is (n, n_features, n_classes)
+        """
+        # Trees compare float32 inputs against their thresholds
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        n, n_classes = len(X), len(self.classes)
+        rows = np.repeat(np.arange(n), len(self.roots))
+        nodes = np.tile(self.roots, n)
+        contributions = np.zeros((n * self.n_features, n_classes))
+
+        for _ in range(self.max_depth):
+            internal = ~self.is_leaf[nodes]
+            if not internal.any():
+                break
+            active, active_rows = nodes[internal], rows[internal]
+            split_feature = self.feature[active]
+            go_left = X[active_rows, split_feature] <= self.threshold[active]
+            child = np.where(go_left, self.left[active], self.right[active])
+
+            delta = self.value[child] - self.value[active]
+            key = (active_rows * self.n_features + split_feature)[:, None] * n_classes + np.arange(n_classes)
+            contributions += np.bincount(key.ravel(), weights=delta.ravel(),
+                                         minlength=contributions.size).reshape(contributions.shape)
+            nodes[internal] = child
+
+        return self.bias, contributions.reshape(n, self.n_features, n_classes)
+
+def is_explainable(model):
+    """
+    True for forests of sklearn decision trees (not e.g. HistGradientBoosting)
+    """
+    estimators = getattr(model, 'estimators_', None)
+    return bool(estimators) and hasattr(estimators[0], 'tree_')
+
+def top_contributors(contributions, feature_names, top=3):
+    """
+    The `top` features pushing hardest towards the class, as (feature, contribution) pairs.
+    NaN contributions (a class the model doesn't know) give an empty list.
+    """
+    contributions = np.nan_to_num(contributions, nan=0.0)
+    order = np.argsort(contributions)[::-1][:top]
+    return [(feature_names[i], float(contributions[i])) for i in order if contributions[i] > 0]
+
+def format_contributors(pairs):
+    """
+    Compact text for storing with a report, e.g. "Packet_Loss +0.214, Latency +0.097"
+    """
+    return ", ".join(f"{feature} {contribution:+.3f}" for feature, contribution in pairs)
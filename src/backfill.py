@@ -0,0 +1,20 @@
+"""
+Classify saved reports whose feedback has no issue_status yet, several notes per Gemini call.
+
+Usage (from the src directory, like the app; PYTHONPATH=.. makes the src package importable):
+    PYTHONPATH=.. python -m src.backfill --batch-size 20
+    USE_FAKE_LLM=1 PYTHONPATH=.. python -m src.backfill
+"""
+import argparse
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill issue_status for stored feedback")
+    parser.add_argument('--batch-size', type=int, default=20, help="Feedback notes per Gemini call")
+    args = parser.parse_args()
+
+    from src.main import backfill_issue_status, configure_genai
+    updated = backfill_issue_status(configure_genai(), args.batch_size)
+    print(f"Updated issue status for {updated} reports")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+CREDENTIALS_DB = 'system_reports.db'
+
+# PBKDF2-SHA256 work factor for new hashes; raise it as hardware gets faster.
+# Existing hashes keep the iteration count they were created with.
+HASH_ITERATIONS = int(os.getenv('PASSWORD_HASH_ITERATIONS', '200000'))
+
+# Verified (username, password) pairs are remembered as keyed digests so reruns and
+# repeated logins skip the deliberately slow hash. The key never leaves the process.
+_SESSION_KEY = secrets.token_bytes(32)
+_SESSION_CACHE_SIZE = 10000
+_verified_sessions = OrderedDict()
+_verified_lock = threading.Lock()
+_migration_lock = threading.Lock()
+
+def get_connection(db_path=CREDENTIALS_DB):
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.execute('''CREATE TABLE IF NOT EXISTS users
+                    (username TEXT PRIMARY KEY,
+                     password_hash BLOB NOT NULL,
+                     salt BLOB NOT NULL,
+                     iterations INTEGER NOT NULL,
+                     created_at TEXT)''')
+    return conn
+
+def hash_password(password, salt, iterations):
+    return hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, iterations)
+
+def _session_digest(username, password):
+    return hmac.new(_SESSION_KEY, f"{username}\0{password}".encode('utf-8'), hashlib.sha256).digest()
+
+def register_user(username, password, db_path=CREDENTIALS_DB, iterations=None):
+    """
+    Atomically create a user. Returns False if the username is already taken.
+    """
+    iterations = iterations or HASH_ITERATIONS
+    salt = secrets.token_bytes(16)
+    password_hash = hash_password(password, salt, iterations)
+    conn = get_connection(db_path)
+    try:
+        with conn:
+            conn.execute('''INSERT INTO users (username, password_hash, salt, iterations, created_at)
+                            VALUES (?, ?, ?, ?, ?)''',
+                         (username, password_hash, salt, iterations,
+                          datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+        return True
+    except sqlite3.IntegrityError:
+        return False
+    finally:
+        conn.close()
+
+def verify_user(username, password, db_path=CREDENTIALS_DB):
+    """
+    Check a username/password pair with one primary-key lookup
+    """
+    digest = _session_digest(username, password)
+    with _verified_lock:
+        if _verified_sessions.get(username) == digest:
+            _verified_sessions.move_to_end(username)
+            return True
+
+    conn = get_connection(db_path)
+    try:
+        row = conn.execute("SELECT password_hash, salt, iterations FROM users WHERE username = ?",
+                           (username,)).fetchone()
+    finally:
+        conn.close()
+    if row is None:
+        return False
+
+    stored_hash, salt, iterations = row
+    if not hmac.compare_digest(hash_password(password, salt, iterations), stored_hash):
+        return False
+
+    with _verified_lock:
+        _verified_sessions[username] = digest
+        _verified_sessions.move_to_end(username)
+        while len(_verified_sessions) > _SESSION_CACHE_SIZE:
+            _verified_sessions.popitem(last=False)
+    return True
+
+def forget_verified_session(username):
+    """
+    Drop a user's cached verification so their next login checks the password hash again
+    """
+    with _verified_lock:
+        _verified_sessions.pop(username, None)
+
+def migrate_json_credentials(json_path="credentials.json", db_path=CREDENTIALS_DB):
+    """
+    One-shot import of the legacy plaintext credentials.json into the users table.
+    All users are inserted in one transaction; usernames that already exist keep their
+    current password and are logged as skipped. The JSON file is removed afterwards so
+    plaintext passwords don't linger on disk. Returns the number of users imported.
+    """
+    with _migration_lock:
+        try:
+            with open(json_path, "r") as f:
+                credentials = json.load(f)
+        except FileNotFoundError:
+            return 0
+
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        rows = []
+        for username, password in credentials.items():
+            salt = secrets.token_bytes(16)
+            rows.append((username, hash_password(password, salt, HASH_ITERATIONS), salt,
+                         HASH_ITERATIONS, timestamp))
+
+        skipped = []
+        conn = get_connection(db_path)
+        try:
+            with conn:
+                for row in rows:
+                    cursor = conn.execute('''INSERT OR IGNORE INTO users
+                                            (username, password_hash, salt, iterations, created_at)
+                                            VALUES (?, ?, ?, ?, ?)''', row)
+                    if cursor.rowcount == 0:
+                        skipped.append(row[0])
+        finally:
+            conn.close()
+        if skipped:
+            print(f"Credential migration skipped existing users: {', '.join(skipped)}")
+
+        # Another process may have finished the same migration first
+        try:
+            os.remove(json_path)
+        except FileNotFoundError:
+            pass
+        return len(rows) - len(skipped)
@@ -0,0 +1,60 @@
+import sqlite3
+import threading
+
+# Process-wide cache for database reads, shared by every Streamlit session.
+# Entries are tagged with the database generation they were read at; any write that
+# bumps the generation makes the next read refetch.
+_cache = {}
+_lock = threading.Lock()
+
+cache_stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+def ensure_generation_table(cursor):
+    cursor.execute('''CREATE TABLE IF NOT EXISTS db_generation
+                      (id INTEGER PRIMARY KEY CHECK (id = 1),
+                       generation INTEGER NOT NULL)''')
+    cursor.execute("INSERT OR IGNORE INTO db_generation (id, generation) VALUES (1, 0)")
+
+def bump_generation(cursor):
+    """
+    Mark cached reads as stale; call inside the same transaction as the write
+    """
+    ensure_generation_table(cursor)
+    cursor.execute("UPDATE db_generation SET generation = generation + 1 WHERE id = 1")
+
+def get_generation(db_path='system_reports.db'):
+    conn = sqlite3.connect(db_path)
+    try:
+        row = conn.execute("SELECT generation FROM db_generation WHERE id = 1").fetchone()
+        return row[0] if row else 0
+    except sqlite3.OperationalError:
+        # Table not created yet, i.e. nothing has been written through the app
+        return 0
+    finally:
+        conn.close()
+
+def cached_read(key, loader, db_path='system_reports.db'):
+    """
+    Return loader() for key, reusing the cached result while the generation is unchanged.
+    Cached values are shared between sessions and must be treated as read-only.
+    """
+    generation = get_generation(db_path)
+    with _lock:
+        entry = _cache.get(key)
+        if entry is not None and entry[0] == generation:
+            cache_stats['hits'] += 1
+            return entry[1]
+
+    # The generation is read before loading, so a write racing with the load
+    # only leaves an entry that is refetched on the next call
+    value = loader()
+    with _lock:
+        cache_stats['misses'] += 1
+        if entry is not None:
+            cache_stats['invalidations'] += 1
+        _cache[key] = (generation, value)
+    return value
+
+def clear_cache():
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,222 @@
+import atexit
+import itertools
+import math
+import os
+import socket
+import sqlite3
+import threading
+from datetime import datetime
+import numpy as np
+
+# Histogram bin edges in training standard deviations. Live values are standardized with
+# the scaler's training mean/std, so one fixed set of edges serves every feature.
+Z_EDGES = np.linspace(-4.0, 4.0, 33)
+
+# A feature is reported as drifted when its window mean moves this many training standard
+# deviations, or its spread changes by more than this factor either way. Both compare
+# against the mean and variance the scaler actually stored; PSI is only informational,
+# since its expected histogram assumes a normal shape many features don't have.
+MEAN_SHIFT_THRESHOLD = 0.5
+STD_RATIO_THRESHOLD = 2.0
+MIN_DRIFT_SAMPLES = 30
+
+_monitor_ids = itertools.count(1)
+
+def _normal_cdf(z):
+    return 0.5 * (1.0 + np.vectorize(math.erf)(z / math.sqrt(2.0)))
+
+class DriftMonitor:
+    """
+    Streaming comparison of live model inputs against the scaler's training statistics.
+    Welford mean/variance and a fixed-bin histogram per feature are updated in O(1) per
+    sample, and each hour's window is scored and persisted as a snapshot before resetting.
+    Snapshots are keyed by worker so processes sharing a database don't overwrite each
+    other; the open window is also saved at interpreter shutdown.
+    """
+
+    def __init__(self, feature_names, training_mean, training_var, db_path='system_reports.db'):
+        self.feature_names = list(feature_names)
+        self.training_mean = np.asarray(training_mean, dtype=np.float64)
+        self.training_std = np.sqrt(np.asarray(training_var, dtype=np.float64))
+        self.training_std[self.training_std == 0] = 1.0
+        self.db_path = db_path
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{next(_monitor_ids)}"
+        self._lock = threading.Lock()
+
+        # The scaler only stores mean and variance, so the PSI reference histogram assumes a
+        # normal training distribution; bins beyond the edges are folded into the end bins
+        cdf = _normal_cdf(Z_EDGES)
+        cdf[0], cdf[-1] = 0.0, 1.0
+        self.expected_fractions = np.diff(cdf)
+
+        self._reset_window(self._current_hour())
+        atexit.register(self.flush)
+
+    def _empty_stats(self):
+        n_features = len(self.feature_names)
+        return {'count': 0, 'mean': np.zeros(n_features), 'm2': np.zeros(n_features)}
+
+    def _reset_window(self, hour):
+        self.window_hour = hour
+        self.window = self._empty_stats()
+        self.window_histogram = np.zeros((len(self.feature_names), len(Z_EDGES) - 1), dtype=np.int64)
+
+    @staticmethod
+    def _current_hour():
+        return datetime.now().strftime("%Y-%m-%d %H:00")
+
+    @staticmethod
+    def _merge(stats, X):
+        """
+        Fold a batch into Welford statistics (Chan et al. parallel update)
+        """
+        n = X.shape[0]
+        batch_mean = X.mean(axis=0)
+        batch_m2 = ((X - batch_mean) ** 2).sum(axis=0)
+        total = stats['count'] + n
+        delta = batch_mean - stats['mean']
+        stats['mean'] = stats['mean'] + delta * (n / total)
+        stats['m2'] = stats['m2'] + batch_m2 + delta ** 2 * (stats['count'] * n / total)
+        stats['count'] = total
+
+    def observe(self, X):
+        """
+        Record a batch of raw (unscaled) input rows
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        if X.shape[0] == 0:
+            return
+        hour = self._current_hour()
+        with self._lock:
+            self._roll_over(hour)
+            self._merge(self.window, X)
+            z = (X - self.training_mean) / self.training_std
+            bins = np.clip(np.searchsorted(Z_EDGES, z, side='right') - 1, 0, len(Z_EDGES) - 2)
+            n_bins = self.window_histogram.shape[1]
+            flat_bins = (bins + np.arange(X.shape[1]) * n_bins).ravel()
+            self.window_histogram += np.bincount(flat_bins, minlength=self.window_histogram.size).reshape(
+                self.window_histogram.shape)
+
+    def _window_quantiles(self, quantiles):
+        """
+        Approximate quantiles per feature from the window histogram, in original units
+        """
+        cumulative = np.cumsum(self.window_histogram, axis=1)
+        totals = cumulative[:, -1:]
+        totals = np.where(totals == 0, 1, totals)
+        result = []
+        for q in quantiles:
+            bin_index = (cumulative / totals < q).sum(axis=1)
+            bin_index = np.minimum(bin_index, len(Z_EDGES) - 2)
+            z = (Z_EDGES[bin_index] + Z_EDGES[bin_index + 1]) / 2
+            result.append(self.training_mean + z * self.training_std)
+        return result
+
+    def scores(self):
+        """
+        Per-feature drift scores for the current window:
+        mean_shift (training std units), std_ratio, psi and p05/p50/p95 estimates.
+        A window whose hour has ended is saved first, even if no prediction arrived since.
+        """
+        with self._lock:
+            self._roll_over(self._current_hour())
+            return self._window_scores()
+
+    def flush(self):
+        """
+        Save the open window as it stands; a later save for the same hour replaces it
+        """
+        with self._lock:
+            if not self._roll_over(self._current_hour()):
+                self._persist_window()
+
+    def _roll_over(self, hour):
+        """
+        Persist and reset the window if its hour has ended; called with the lock held
+        """
+        if hour == self.window_hour:
+            return False
+        self._persist_window()
+        self._reset_window(hour)
+        return True
+
+    def _window_scores(self):
+        count = self.window['count']
+        mean = self.window['mean']
+        std = np.sqrt(self.window['m2'] / count) if count else np.zeros_like(mean)
+        observed = self.window_histogram / max(count, 1)
+        p05, p50, p95 = self._window_quantiles((0.05, 0.5, 0.95))
+
+        expected = np.maximum(self.expected_fractions, 1e-6)
+        observed_safe = np.maximum(observed, 1e-6)
+        psi = ((observed_safe - expected) * np.log(observed_safe / expected)).sum(axis=1)
+
+        mean_shift = (mean - self.training_mean) / self.training_std
+        std_ratio = std / self.training_std
+        drifted = (count >= MIN_DRIFT_SAMPLES) & (
+            (np.abs(mean_shift) > MEAN_SHIFT_THRESHOLD)
+            | (std_ratio > STD_RATIO_THRESHOLD) | (std_ratio < 1 / STD_RATIO_THRESHOLD))
+
+        rows = []
+        for i, name in enumerate(self.feature_names):
+            rows.append({
+                'feature': name,
+                'count': count,
+                'mean': float(mean[i]),
+                'std': float(std[i]),
+                'p05': float(p05[i]),
+                'p50': float(p50[i]),
+                'p95': float(p95[i]),
+                'mean_shift': float(mean_shift[i]) if count else 0.0,
+                'std_ratio': float(std_ratio[i]) if count else 0.0,
+                'psi': float(psi[i]) if count else 0.0,
+                'drifted': bool(drifted[i]),
+            })
+        return rows
+
+    def _persist_window(self):
+        """
+        Save the window's scores; called with the lock held
+        """
+        if self.window['count'] == 0:
+            return
+        save_drift_snapshot(self.window_hour, self._window_scores(), self.db_path, self.worker_id)
+
+def save_drift_snapshot(hour, rows, db_path='system_reports.db', worker_id=None):
+    """
+    Store one row per feature for a worker's hourly window; sum sample_count over
+    workers for the hour's total
+    """
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    conn = sqlite3.connect(db_path)
+    try:
+        c = conn.cursor()
+        # Tables from before snapshots were keyed by worker are kept under a new name
+        c.execute("PRAGMA table_info(drift_snapshots)")
+        columns = [column[1] for column in c.fetchall()]
+        if columns and 'worker' not in columns:
+            c.execute("ALTER TABLE drift_snapshots RENAME TO drift_snapshots_unkeyed")
+        c.execute('''CREATE TABLE IF NOT EXISTS drift_snapshots
+                     (hour TEXT,
+                      worker TEXT,
+                      feature TEXT,
+                      sample_count INTEGER,
+                      mean REAL,
+                      std REAL,
+                      p05 REAL,
+                      p50 REAL,
+                      p95 REAL,
+                      mean_shift REAL,
+                      std_ratio REAL,
+                      psi REAL,
+                      drifted INTEGER,
+                      PRIMARY KEY (hour, worker, feature))''')
+        c.executemany('''INSERT OR REPLACE INTO drift_snapshots VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+                      [(hour, worker_id, row['feature'], row['count'], row['mean'], row['std'], row['p05'],
+                        row['p50'], row['p95'], row['mean_shift'], row['std_ratio'], row['psi'],
+                        int(row['drifted'])) for row in rows])
+        conn.commit()
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+    finally:
+        conn.close()
@@ -0,0 +1,163 @@
+"""
+Stream the reports table to CSV, JSON lines or Parquet in fixed-size chunks.
+
+Usage (from the src directory, like the app; PYTHONPATH=.. makes the src package importable):
+    PYTHONPATH=.. python -m src.export --format csv --out reports.csv
+    PYTHONPATH=.. python -m src.export --format parquet --out critical.parquet --state CRITICAL --start 2024-01-01
+"""
+import argparse
+import contextlib
+import os
+import sqlite3
+import tempfile
+import pandas as pd
+
+EXPORT_FORMATS = {'csv': '.csv', 'jsonl': '.jsonl', 'parquet': '.parquet'}
+
+# The app's download button holds the whole file in memory (plus Streamlit's own copy),
+# so in-app exports are refused above this many rows; the CLI has no limit
+UI_EXPORT_MAX_ROWS = int(os.getenv('UI_EXPORT_MAX_ROWS', '100000'))
+
+def build_export_query(start_date=None, end_date=None, states=None, issue_statuses=None):
+    """
+    SELECT for the reports table with filters applied in SQL.
+    Dates compare against Date_and_Time ("YYYY-MM-DD HH:MM:SS"); end_date is inclusive.
+    """
+    clauses, params = [], []
+    if start_date:
+        clauses.append("Date_and_Time >= ?")
+        params.append(str(start_date))
+    if end_date:
+        clauses.append("Date_and_Time < date(?, '+1 day')")
+        params.append(str(end_date))
+    if states:
+        clauses.append(f"System_State IN ({', '.join('?' * len(states))})")
+        params.extend(states)
+    if issue_statuses:
+        clauses.append(f"issue_status IN ({', '.join('?' * len(issue_statuses))})")
+        params.extend(issue_statuses)
+
+    query = "SELECT * FROM reports"
+    if clauses:
+        query += " WHERE " + " AND ".join(clauses)
+    return query + " ORDER BY id", params
+
+def count_export_rows(db_path='system_reports.db', **filters):
+    """
+    Number of reports an export with these filters would write
+    """
+    query, params = build_export_query(**filters)
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM ({query})", params).fetchone()[0]
+    finally:
+        conn.close()
+
+def iter_report_chunks(db_path='system_reports.db', chunksize=10000, **filters):
+    """
+    Yield DataFrames of at most `chunksize` rows; only one chunk is held in memory at a time
+    """
+    query, params = build_export_query(**filters)
+    conn = sqlite3.connect(db_path)
+    try:
+        for chunk in pd.read_sql_query(query, conn, params=params, chunksize=chunksize):
+            yield chunk
+    finally:
+        conn.close()
+
+def export_reports(out_path, fmt='csv', db_path='system_reports.db', chunksize=10000, **filters):
+    """
+    Write matching reports to out_path chunk by chunk and return the number of rows written
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}; choose from {', '.join(EXPORT_FORMATS)}")
+
+    rows = 0
+    writer = None
+    try:
+        with open(out_path, 'w', newline='', encoding='utf-8') if fmt != 'parquet' else contextlib.nullcontext() as f:
+            if fmt == 'parquet':
+                # Open the writer up front with a schema from the declared column types, so
+                # chunks whose columns happen to be all NULL still match, and an empty
+                # result still produces a valid file
+                writer = _open_parquet_writer(out_path, db_path)
+            for chunk in iter_report_chunks(db_path, chunksize, **filters):
+                if fmt == 'csv':
+                    chunk.to_csv(f, header=(rows == 0), index=False)
+                elif fmt == 'jsonl':
+                    # to_json ends each chunk with a newline in recent pandas, but not in older ones
+                    text = chunk.to_json(orient='records', lines=True, force_ascii=False)
+                    f.write(text if text.endswith('\n') else text + '\n')
+                else:
+                    _write_parquet_chunk(writer, chunk)
+                rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+def _open_parquet_writer(out_path, db_path):
+    """
+    ParquetWriter whose schema follows the reports table's SQLite column types
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet export requires pyarrow (pip install pyarrow)")
+
+    conn = sqlite3.connect(db_path)
+    try:
+        columns = conn.execute("PRAGMA table_info(reports)").fetchall()
+    finally:
+        conn.close()
+    # SQLite doesn't enforce declared types (live telemetry stores fractional CPU values in
+    # INTEGER columns), so every numeric column except the primary key is written as float64
+    fields = []
+    for _, name, declared_type, _, _, primary_key in columns:
+        if primary_key:
+            fields.append((name, pa.int64()))
+        elif declared_type.upper() in ('INTEGER', 'REAL'):
+            fields.append((name, pa.float64()))
+        else:
+            fields.append((name, pa.string()))
+    return pq.ParquetWriter(out_path, pa.schema(fields))
+
+def _write_parquet_chunk(writer, chunk):
+    import pyarrow as pa
+    writer.write_table(pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False))
+
+def export_to_tempfile(fmt='csv', db_path='system_reports.db', chunksize=10000, **filters):
+    """
+    Export into a named temporary file and return its path; the caller removes it
+    """
+    fd, path = tempfile.mkstemp(prefix='reports_export_', suffix=EXPORT_FORMATS[fmt])
+    os.close(fd)
+    try:
+        export_reports(path, fmt, db_path, chunksize, **filters)
+    except Exception:
+        os.remove(path)
+        raise
+    return path
+
+def main():
+    parser = argparse.ArgumentParser(description="Export reports in fixed-size chunks")
+    parser.add_argument('--db', default='system_reports.db', help="SQLite database with the reports table")
+    parser.add_argument('--out', required=True, help="Output file path")
+    parser.add_argument('--format', choices=sorted(EXPORT_FORMATS), default='csv')
+    parser.add_argument('--chunksize', type=int, default=10000, help="Rows read and written per chunk")
+    parser.add_argument('--start', help="Earliest date to include (YYYY-MM-DD)")
+    parser.add_argument('--end', help="Latest date to include (YYYY-MM-DD)")
+    parser.add_argument('--state', action='append', choices=["NORMAL", "WARNING", "CRITICAL"],
+                        help="System state to include (repeatable)")
+    parser.add_argument('--issue-status', action='append', choices=["RESOLVED", "UNRESOLVED"],
+                        help="Issue status to include (repeatable)")
+    args = parser.parse_args()
+
+    rows = export_reports(args.out, args.format, args.db, args.chunksize,
+                          start_date=args.start, end_date=args.end,
+                          states=args.state, issue_statuses=args.issue_status)
+    print(f"Exported {rows} reports to {args.out}")
+
+if __name__ == "__main__":
+    main()
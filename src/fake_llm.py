@@ -0,0 +1,40 @@
+import re
+import time
+
+# Offline stand-in for genai.GenerativeModel, used by the load test and for local
+# development without an API key (USE_FAKE_LLM=1). It answers in the formats the
+# app's prompts ask for, with an optional simulated latency.
+
+RESOLVED_WORDS = ("fixed", "resolved", "restored", "back to normal", "restarted")
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+def _status_for(text):
+    lowered = text.lower()
+    return "RESOLVED" if any(word in lowered for word in RESOLVED_WORDS) else "UNRESOLVED"
+
+class FakeGenerativeModel:
+    def __init__(self, latency=0.0):
+        self.latency = latency
+
+    def generate_content(self, prompt, stream=False):
+        time.sleep(self.latency)
+        if "Respond with one block per item" in prompt:
+            blocks = []
+            for item_id, body in re.findall(r"ITEM (\S+):\n(.*?)\nEND ITEM \1", prompt, re.S):
+                blocks.append(f"ITEM: {item_id}\nSTATUS: {_status_for(body)}\n"
+                              f"REASONING: Fake analysis\nKEY POINTS:\n- {body.strip()[:80]}")
+            text = "\n\n".join(blocks)
+        elif "STATUS: [RESOLVED/UNRESOLVED]" in prompt:
+            feedback = prompt.split("Feedback to analyze:", 1)[-1].split("Respond in this exact format:", 1)[0]
+            text = (f"STATUS: {_status_for(feedback)}\nREASONING: Fake analysis\n"
+                    f"KEY POINTS:\n- {feedback.strip()[:80]}")
+        else:
+            text = "This is a placeholder answer from the offline model. The system data looks consistent."
+
+        if stream:
+            words = text.split(" ")
+            return [FakeResponse(word + (" " if i < len(words) - 1 else "")) for i, word in enumerate(words)]
+        return FakeResponse(text)
@@ -0,0 +1,208 @@
+import os
+import sqlite3
+import math
+import threading
+import time
+
+# Feedback is only classified locally when the model is at least this confident
+CONFIDENCE_THRESHOLD = float(os.getenv('FEEDBACK_CONFIDENCE_THRESHOLD', '0.9'))
+
+# Minimum number of labelled notes (of each status) needed before the local model is used
+MIN_TRAINING_SAMPLES = 10
+
+# Retrain after this many labelled notes have been saved since the last training
+RETRAIN_AFTER_LABELS = int(os.getenv('FEEDBACK_RETRAIN_AFTER', '20'))
+
+# While there isn't enough data for a first model, retry at most this often
+COLD_START_RETRY_SECONDS = 60
+
+# Where a stored issue_status came from (reports.issue_status_source). Only LLM labels
+# are used for training, so the local model never learns from its own predictions or
+# from the UNRESOLVED default written when Gemini fails.
+LABEL_SOURCE_LLM = 'llm'
+LABEL_SOURCE_LOCAL = 'local'
+LABEL_SOURCE_DEFAULT = 'default'
+TRAINING_LABEL_SOURCES = (LABEL_SOURCE_LLM,)
+
+routing_stats = {'local': 0, 'escalated': 0}
+
+# Training runs on a background thread and swaps in the new classifier when done;
+# the lock only guards this bookkeeping, never the training itself
+_classifier = None
+_classifier_loaded = False
+_training = False
+_last_training_start = 0.0
+_new_labels = 0
+_classifier_lock = threading.Lock()
+
+def extract_original_feedback(stored_feedback):
+    """
+    Strip the generated Status/Key Points header that save_report_to_db prepends
+    """
+    if 'Original Feedback:' in stored_feedback:
+        return stored_feedback.split('Original Feedback:', 1)[1].strip()
+    return stored_feedback.strip()
+
+def load_training_data(db_path='system_reports.db'):
+    """
+    Load (feedback, issue_status) pairs labelled by a trusted source from the reports table
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        c = conn.cursor()
+        # Tables from before label sources were recorded have no trusted labels yet
+        c.execute("PRAGMA table_info(reports)")
+        if 'issue_status_source' not in [column[1] for column in c.fetchall()]:
+            return [], []
+        c.execute(f"""SELECT feedback, issue_status FROM reports
+                      WHERE feedback IS NOT NULL AND issue_status IN ('RESOLVED', 'UNRESOLVED')
+                      AND username NOT LIKE 'live:%'
+                      AND issue_status_source IN ({', '.join('?' * len(TRAINING_LABEL_SOURCES))})""",
+                  TRAINING_LABEL_SOURCES)
+        rows = c.fetchall()
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        return [], []
+    finally:
+        conn.close()
+
+    texts, labels = [], []
+    for feedback, issue_status in rows:
+        text = extract_original_feedback(feedback)
+        if text:
+            texts.append(text)
+            labels.append(issue_status)
+    return texts, labels
+
+def train_feedback_classifier(texts, labels):
+    """
+    Fit a bag-of-words logistic regression and flatten it into a token -> weight table.
+    Returns None when there isn't enough labelled data for both statuses.
+    """
+    if min(labels.count("RESOLVED"), labels.count("UNRESOLVED")) < MIN_TRAINING_SAMPLES:
+        return None
+
+    from sklearn.feature_extraction.text import CountVectorizer
+    from sklearn.linear_model import LogisticRegression
+
+    vectorizer = CountVectorizer(ngram_range=(1, 2), binary=True, lowercase=True)
+    features = vectorizer.fit_transform(texts)
+    model = LogisticRegression(max_iter=1000)
+    model.fit(features, [label == "RESOLVED" for label in labels])
+
+    # With binary features the decision function is just intercept + sum of the present
+    # tokens' weights, so inference needs a dict lookup per token and no sparse matrices
+    coefficients = model.coef_[0]
+    weights = {token: float(coefficients[index]) for token, index in vectorizer.vocabulary_.items()}
+    return {
+        'analyzer': vectorizer.build_analyzer(),
+        'weights': weights,
+        'intercept': float(model.intercept_[0]),
+    }
+
+def get_feedback_classifier(db_path='system_reports.db'):
+    """
+    Return the process-wide classifier, or None while none has been trained.
+    The first call starts training in the background.
+    """
+    if not _classifier_loaded:
+        start_training(db_path)
+    return _classifier
+
+def _train_and_swap(db_path):
+    global _classifier, _classifier_loaded, _training
+    try:
+        classifier = train_feedback_classifier(*load_training_data(db_path))
+    except Exception as e:
+        print(f"Error training feedback classifier: {e}")
+        with _classifier_lock:
+            _training = False
+        return
+    with _classifier_lock:
+        _classifier = classifier
+        _classifier_loaded = True
+        _training = False
+
+def start_training(db_path='system_reports.db', wait=False):
+    """
+    Retrain from the database on a background thread unless a run is already in progress.
+    Classification keeps using the previous model until the new one is ready.
+    """
+    global _training, _last_training_start, _new_labels
+    with _classifier_lock:
+        if _training:
+            return None
+        _training = True
+        _last_training_start = time.monotonic()
+        # Labels saved while this run trains count towards the next one
+        _new_labels = 0
+    thread = threading.Thread(target=_train_and_swap, args=(db_path,), daemon=True)
+    thread.start()
+    if wait:
+        thread.join()
+    return thread
+
+def refresh_feedback_classifier(db_path='system_reports.db'):
+    """
+    Retrain the classifier from the current contents of the database and wait for it
+    """
+    start_training(db_path, wait=True)
+    return _classifier
+
+def record_labelled_feedback(db_path='system_reports.db'):
+    """
+    Note that a labelled feedback note was saved and start a background retrain once
+    RETRAIN_AFTER_LABELS have accumulated. Until there is enough data for a first model,
+    retries are limited to one per COLD_START_RETRY_SECONDS.
+    """
+    global _new_labels
+    with _classifier_lock:
+        _new_labels += 1
+        cold_start_due = (_classifier_loaded and _classifier is None
+                          and time.monotonic() - _last_training_start >= COLD_START_RETRY_SECONDS)
+        retrain_due = cold_start_due or _new_labels >= RETRAIN_AFTER_LABELS
+    if retrain_due:
+        start_training(db_path)
+
+def classify_feedback(feedback_text, classifier):
+    """
+    Return (status, confidence) for a feedback note using the local classifier
+    """
+    score = classifier['intercept']
+    weights = classifier['weights']
+    for token in set(classifier['analyzer'](feedback_text)):
+        score += weights.get(token, 0.0)
+    probability = 1.0 / (1.0 + math.exp(-max(min(score, 50.0), -50.0)))
+    if probability >= 0.5:
+        return "RESOLVED", probability
+    return "UNRESOLVED", 1.0 - probability
+
+def try_local_classification(feedback_text, threshold=None):
+    """
+    Classify feedback locally if the model is confident enough.
+    Returns (status, confidence), or None when the note should be escalated to the LLM.
+    """
+    if threshold is None:
+        threshold = CONFIDENCE_THRESHOLD
+    classifier = get_feedback_classifier()
+    if classifier is not None:
+        status, confidence = classify_feedback(feedback_text, classifier)
+        if confidence >= threshold:
+            routing_stats['local'] += 1
+            return status, confidence
+    routing_stats['escalated'] += 1
+    return None
+
+def escalation_rate():
+    """
+    Fraction of feedback notes that were sent to the LLM
+    """
+    total = routing_stats['local'] + routing_stats['escalated']
+    return routing_stats['escalated'] / total if total else 0.0
+
+def split_key_points(feedback_text, limit=3):
+    """
+    Use the first few sentences of a note as its key points when no LLM summary is made
+    """
+    sentences = [s.strip().replace('\n', ' ') for s in feedback_text.split('.') if s.strip()]
+    return sentences[:limit]
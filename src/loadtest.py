@@ -0,0 +1,202 @@
+"""
+Concurrent-session load test: each simulated operator runs
+login -> predict -> save report -> vote -> search against a scratch copy of the database,
+with Gemini replaced by the offline fake model.
+
+Usage (from the repository root):
+    python -m src.loadtest --sessions 1 4 16 --iterations 20
+"""
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+ACTIONS = ["login", "predict", "save_report", "vote", "search"]
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+FEEDBACK_SAMPLES = [
+    "Restarted the service, back to normal.",
+    "Still seeing packet loss on the uplink.",
+    "Fixed after clearing the cache.",
+    "Latency spikes continue during peak hours, vendor ticket open.",
+]
+
+def prepare_workspace(db_path=None):
+    """
+    Create a scratch directory laid out like src/ (Models one level up) holding a copy of
+    the reports database, and chdir into it. Returns the directory to clean up.
+    """
+    workspace = tempfile.mkdtemp(prefix='noc_loadtest_')
+    work_dir = os.path.join(workspace, 'work')
+    os.makedirs(work_dir)
+    source_db = db_path or os.path.join(REPO_ROOT, 'Database', 'system_reports.db')
+    shutil.copy(source_db, os.path.join(work_dir, 'system_reports.db'))
+    models_dir = os.path.join(REPO_ROOT, 'Models')
+    try:
+        os.symlink(models_dir, os.path.join(workspace, 'Models'))
+    except (OSError, NotImplementedError):
+        shutil.copytree(models_dir, os.path.join(workspace, 'Models'))
+    os.chdir(work_dir)
+    return workspace
+
+def random_input():
+    return {
+        'CPU_Utilization': random.randint(0, 100),
+        'Memory_Usage': random.randint(0, 100),
+        'Bandwidth_Utilization': random.randint(0, 100),
+        'Throughput': random.uniform(0, 500),
+        'Latency': random.uniform(0, 200),
+        'Jitter': random.uniform(0, 40),
+        'Packet_Loss': random.uniform(0, 5),
+        'Error_Rates': random.uniform(0, 10),
+        'Connection_Establishment_Termination_Times': random.uniform(0, 1500),
+        'Network_Availability': random.randint(90, 100),
+        'Transmission_Delay': random.uniform(0, 300),
+        'Grid_Voltage': random.uniform(100, 240),
+        'Cooling_Temperature': random.uniform(15, 40),
+        'Network_Traffic_Volume': random.uniform(0, 1500),
+    }
+
+class LoadTestStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {action: [] for action in ACTIONS}
+        self.errors = {action: 0 for action in ACTIONS}
+        self.lock_errors = 0
+        self.flows = 0
+
+    def record(self, action, seconds):
+        with self.lock:
+            self.latencies[action].append(seconds)
+
+    def record_error(self, action, error=None):
+        with self.lock:
+            self.errors[action] += 1
+            if error is not None and 'locked' in str(error).lower():
+                self.lock_errors += 1
+
+def timed(stats, action, func, *args, **kwargs):
+    """
+    Run one action, recording its latency. Returns (succeeded, result).
+    """
+    start = time.perf_counter()
+    try:
+        result = func(*args, **kwargs)
+    except Exception as e:
+        stats.record(action, time.perf_counter() - start)
+        stats.record_error(action, e)
+        return False, None
+    stats.record(action, time.perf_counter() - start)
+    return True, result
+
+def run_session(session_id, iterations, stats, fake_model):
+    """
+    One operator: log in, then repeat predict -> save report -> vote -> search
+    """
+    from src import main as app
+    from src.credentials import register_user, verify_user, forget_verified_session
+    from src.model import STATUS_NAMES
+
+    username = f"loadtest_{session_id}"
+    password = f"password-{session_id}"
+    register_user(username, password)
+
+    for _ in range(iterations):
+        # Each login is a fresh one: without this, verify_user answers from its in-process
+        # cache and the users lookup and PBKDF2 check are never measured
+        forget_verified_session(username)
+        ok, verified = timed(stats, "login", verify_user, username, password)
+        if ok and not verified:
+            stats.record_error("login")
+        if not verified:
+            continue
+
+        input_data = random_input()
+        ok, prediction = timed(stats, "predict", app.predict, **input_data)
+        if not ok:
+            continue
+        status = STATUS_NAMES.get(prediction, "UNKNOWN")
+        input_data['System_State'] = status
+
+        report_text = app.generate_report_text(input_data, status)
+        timed(stats, "save_report", app.save_report_to_db, input_data, status, report_text,
+              random.choice(FEEDBACK_SAMPLES), fake_model, username)
+
+        reports = app.get_saved_reports()
+        if not reports.empty:
+            report_id = int(reports['id'].iloc[random.randrange(len(reports))])
+            # Re-raise database errors so "database is locked" is counted as a lock error
+            ok, updated_row = timed(stats, "vote", app.update_vote, report_id, username,
+                                    random.choice(['upvote', 'downvote']), raise_errors=True)
+            if ok and updated_row is None:
+                stats.record_error("vote")
+
+        def search():
+            reports = app.get_saved_reports()
+            return reports[reports['report_text'].str.contains("CPU", case=False, na=False)]
+        timed(stats, "search", search)
+
+        with stats.lock:
+            stats.flows += 1
+
+def run_level(sessions, iterations, fake_model):
+    stats = LoadTestStats()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as executor:
+        futures = [executor.submit(run_session, i, iterations, stats, fake_model) for i in range(sessions)]
+        for future in futures:
+            future.result()
+    return stats, time.perf_counter() - start
+
+def print_level(sessions, stats, elapsed):
+    print(f"\n=== {sessions} concurrent session(s): {stats.flows} flows in {elapsed:.1f}s "
+          f"({stats.flows / elapsed:.1f} flows/s), DB lock errors: {stats.lock_errors}")
+    print(f"{'action':<12} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'ops/s':>8} {'errors':>7}")
+    for action in ACTIONS:
+        samples = np.array(stats.latencies[action]) * 1000
+        if len(samples) == 0:
+            continue
+        p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+        print(f"{action:<12} {len(samples):>6} {p50:>9.1f} {p95:>9.1f} {p99:>9.1f} "
+              f"{len(samples) / elapsed:>8.1f} {stats.errors[action]:>7}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-session load test with the offline LLM")
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 2, 4, 8, 16],
+                        help="Concurrency levels to run, one after another")
+    parser.add_argument('--iterations', type=int, default=10, help="Flows per session")
+    parser.add_argument('--llm-latency', type=float, default=0.0, help="Simulated seconds per fake LLM call")
+    parser.add_argument('--db', help="Database to copy as the starting state (defaults to Database/system_reports.db)")
+    parser.add_argument('--keep', action='store_true', help="Keep the scratch workspace for inspection")
+    parser.add_argument('--metrics-out', help="Write per-stage timings in Prometheus text format to this file")
+    args = parser.parse_args()
+
+    from src.fake_llm import FakeGenerativeModel
+    fake_model = FakeGenerativeModel(latency=args.llm_latency)
+
+    original_dir = os.getcwd()
+    metrics_out = os.path.abspath(args.metrics_out) if args.metrics_out else None
+    workspace = prepare_workspace(args.db)
+    try:
+        for sessions in args.sessions:
+            stats, elapsed = run_level(sessions, args.iterations, fake_model)
+            print_level(sessions, stats, elapsed)
+        if metrics_out:
+            from src.metrics import write_prometheus_file
+            write_prometheus_file(metrics_out)
+            print(f"\nStage metrics written to {metrics_out}")
+    finally:
+        os.chdir(original_dir)
+        if args.keep:
+            print(f"\nWorkspace kept at {workspace}")
+        else:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
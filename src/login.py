@@ -1,23 +1,12 @@
 import streamlit as st
-import json
-import os
-from src.main import main
-
-def load_credentials():
-    if not os.path.exists("credentials.json"):
-        with open("credentials.json", "w") as f:
-            json.dump({}, f)
-    
-    with open("credentials.json", "r") as f:
-        return json.load(f)
-
-def save_credentials(credentials):
-    with open("credentials.json", "w") as f:
-        json.dump(credentials, f, indent=4)
+from src.credentials import register_user, verify_user, migrate_json_credentials
 
 def login_page():
     st.title("Welcome! 👋")
     
+    # Import any users left in the legacy plaintext credentials file
+    migrate_json_credentials()
+    
     # Initialize session state variables
     if 'logged_in' not in st.session_state:
         st.session_state.logged_in = False
@@ -34,8 +23,7 @@ def login_page():
         password = st.text_input("Password", type="password", key="login_password")
         
         if st.button("Login"):
-            credentials = load_credentials()
-            if username in credentials and credentials[username] == password:
+            if verify_user(username, password):
                 st.session_state.logged_in = True
                 st.session_state.username = username
                 st.success("Login successful!")
@@ -53,19 +41,17 @@ def login_page():
         if st.button("Register"):
             if new_password != confirm_password:
                 st.error("Passwords don't match!")
+            elif register_user(new_username, new_password):
+                st.success("Registration successful! Please login.")
             else:
-                credentials = load_credentials()
-                if new_username in credentials:
-                    st.error("Username already exists!")
-                else:
-                    credentials[new_username] = new_password
-                    save_credentials(credentials)
-                    st.success("Registration successful! Please login.")
+                st.error("Username already exists!")
     
 # Main flow control
 if __name__ == "__main__":
     if not st.session_state.get('logged_in', False):
         login_page()
     else:
+        # Imported here so the login form doesn't pay for pandas, Gemini and the model
+        from src.main import main
         # Pass the logged-in username to the main function
         main(st.session_state.username)
\ No newline at end of file
@@ -1,11 +1,22 @@
 import streamlit as st
 import pandas as pd
 import sqlite3
+import time
+from collections import deque
 from datetime import datetime
-import google.generativeai as genai
 import os
 from dotenv import load_dotenv
-from src.model import predict
+from src.model import predict, FEATURE_NAMES, STATUS_NAMES, get_drift_monitor, explain_batch
+from src.attribution import top_contributors, format_contributors
+from src.rules import evaluate_rules, issues_for, describe_rules
+from src.report_templates import render_report
+from src.telemetry import StubSource, FileTailSource, UDPSource, TelemetryMonitor
+from src.export import EXPORT_FORMATS, UI_EXPORT_MAX_ROWS, count_export_rows, export_to_tempfile
+from src.db_cache import cached_read, bump_generation, ensure_generation_table, get_generation, cache_stats
+from src.feedback_classifier import (try_local_classification, split_key_points, routing_stats, escalation_rate,
+                                     record_labelled_feedback, LABEL_SOURCE_LLM, LABEL_SOURCE_LOCAL,
+                                     LABEL_SOURCE_DEFAULT, TRAINING_LABEL_SOURCES)
+from src.metrics import timer, timed, observe, summary_rows, render_prometheus, start_metrics_server
 
 def get_status_color(status):
     return {
@@ -18,6 +29,11 @@ def get_status_color(status):
 load_dotenv()
 
 def configure_genai():
+    if os.getenv('USE_FAKE_LLM') == '1':
+        from src.fake_llm import FakeGenerativeModel
+        return FakeGenerativeModel()
+    # Imported on first use; the Gemini client is only needed by Q&A and report saving
+    import google.generativeai as genai
     api_key = os.getenv('GOOGLE_API_KEY')
     if api_key is None:
         raise ValueError("GOOGLE_API_KEY is not set in the .env file")
@@ -27,6 +43,7 @@ def configure_genai():
 import sqlite3
 import os
 
+@timed('sqlite_seconds', operation='create_database')
 def create_database():
     # Define the database path
     db_path = os.path.join(os.path.dirname(__file__), '..', 'Database', 'system_reports.db')
@@ -85,10 +102,18 @@ def create_database():
                      vote_type TEXT,
                      PRIMARY KEY (username, report_id))''')
     
+    # Generation counter used to invalidate cached reads
+    ensure_generation_table(c)
+    
     conn.commit()
     conn.close()
     
-def update_vote(report_id, username, vote_type):
+@timed('sqlite_seconds', operation='update_vote')
+def update_vote(report_id, username, vote_type, raise_errors=False):
+    """
+    Apply, change or withdraw a user's vote. Returns the updated report row, or None on error
+    (database errors are re-raised instead when raise_errors is set).
+    """
     conn = sqlite3.connect('system_reports.db')
     c = conn.cursor()
     
@@ -146,11 +171,20 @@ def update_vote(report_id, username, vote_type):
                            SET downvotes = downvotes + 1 
                            WHERE id = ?""", (report_id,))
         
+        bump_generation(c)
         conn.commit()
-        return True
+        
+        # Return the updated row so the caller can re-render without re-reading the table
+        c.execute("SELECT * FROM reports WHERE id = ?", (report_id,))
+        row = c.fetchone()
+        if row is None:
+            return None
+        return pd.Series(row, index=[column[0] for column in c.description])
     except sqlite3.Error as e:
+        if raise_errors:
+            raise
         print(f"Database error: {e}")
-        return False
+        return None
     finally:
         conn.close()
 
@@ -183,116 +217,46 @@ def show_reports_tab():
             if st.button("Delete Report", key=f"delete_{report['id']}"):
                 delete_report(report['id'])
                 st.rerun()
-def generate_remediation_suggestions(input_data, prediction):
-    suggestions = []
-    
-    if input_data['CPU_Utilization'] >= 80:
-        suggestions.append("- Identify and terminate resource-intensive processes\n- Consider upgrading CPU capacity\n- Implement better load balancing")
-    
-    if input_data['Memory_Usage'] >= 80:
-        suggestions.append("- Clear system cache\n- Optimize memory-intensive applications\n- Consider increasing RAM capacity")
-    
-    if input_data['Error_Rates'] >= 5:
-        suggestions.append("- Review system logs for error patterns\n- Update system dependencies\n- Implement error tracking and monitoring")
-    
-    if input_data['Network_Traffic_Volume'] > 1000:  # Assuming 1000 Mbps threshold
-        suggestions.append("- Review network traffic patterns\n- Implement traffic shaping\n- Consider bandwidth upgrade")
-    
-    if input_data['Cooling_Temperature'] > 30:
-        suggestions.append("- Check cooling system functionality\n- Ensure proper ventilation\n- Monitor temperature trends")
-    
-    if input_data['Bandwidth_Utilization'] > 90:
-        suggestions.append("- Analyze bandwidth consumption patterns\n- Implement QoS policies\n- Consider bandwidth optimization techniques")
-    
-    if input_data['Latency'] > 100:  # Assuming 100ms threshold
-        suggestions.append("- Check network connectivity\n- Identify network bottlenecks\n- Optimize network routing")
-    
-    if input_data['Packet_Loss'] > 2:  # Assuming 2% threshold
-        suggestions.append("- Investigate network connectivity issues\n- Check for network congestion\n- Verify network hardware functionality")
-    
-    if input_data['Jitter'] > 30:  # Assuming 30ms threshold
-        suggestions.append("- Monitor network stability\n- Implement jitter buffering\n- Check for network interference")
-    
-    if input_data['Network_Availability'] < 99:  # Assuming 99% threshold
-        suggestions.append("- Review network infrastructure\n- Implement redundancy measures\n- Check for single points of failure")
-    
-    if input_data['Transmission_Delay'] > 200:  # Assuming 200ms threshold
-        suggestions.append("- Optimize data transmission paths\n- Review network topology\n- Consider content delivery optimization")
-    
-    if input_data['Connection_Establishment_Termination_Times'] > 1000:  # Assuming 1000ms threshold
-        suggestions.append("- Check connection pooling settings\n- Optimize connection handling\n- Review connection timeout parameters")
-    
-    return "\n\n".join(suggestions) if suggestions else "No immediate actions required. Continue regular monitoring."
+def get_top_contributors(input_data, status, top=3):
+    """
+    Features that pushed the model hardest towards `status`, as (feature, contribution) pairs
+    """
+    class_labels = {name: label for label, name in STATUS_NAMES.items()}
+    if status not in class_labels:
+        return []
+    contributions = explain_batch([[input_data[name] for name in FEATURE_NAMES]], [class_labels[status]])
+    if contributions is None:
+        return []
+    return top_contributors(contributions[0], FEATURE_NAMES, top)
 
 def generate_report_text(input_data, prediction):
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    remediation = generate_remediation_suggestions(input_data, prediction)
-    
-    # Generate system diagnosis
-    issues = []
-    if input_data['CPU_Utilization'] >= 80:
-        issues.append("High CPU utilization indicating system overload")
-    if input_data['Memory_Usage'] >= 80:
-        issues.append("Elevated memory usage suggesting resource constraints")
-    if input_data['Error_Rates'] >= 5:
-        issues.append("High error rates detected indicating potential system issues")
-    if input_data['Network_Traffic_Volume'] > 1000:
-        issues.append("Excessive network traffic detected suggesting potential network congestion")
-    if input_data['Cooling_Temperature'] > 30:
-        issues.append("Elevated cooling temperature indicating potential cooling system issues")
-    if input_data['Bandwidth_Utilization'] > 90:
-        issues.append("High bandwidth utilization indicating potential network bottleneck")
-    if input_data['Latency'] > 100:
-        issues.append("High network latency detected affecting system performance")
-    if input_data['Packet_Loss'] > 2:
-        issues.append("Significant packet loss detected affecting network reliability")
-    if input_data['Jitter'] > 30:
-        issues.append("High jitter levels affecting network stability")
-    if input_data['Network_Availability'] < 99:
-        issues.append("Reduced network availability affecting system reliability")
-    if input_data['Transmission_Delay'] > 200:
-        issues.append("High transmission delay affecting data transfer efficiency")
-    
-    diagnosis = "No significant issues detected." if not issues else "\n- ".join(issues)
-    
-    report = f"""System Status Report - {timestamp}
-    
-Overall Status: {prediction}
-
-Network Performance Metrics:
-- Bandwidth Utilization: {input_data['Bandwidth_Utilization']}%
-- Throughput: {input_data['Throughput']} Mbps
-- Latency: {input_data['Latency']} ms
-- Jitter: {input_data['Jitter']} ms
-- Packet Loss: {input_data['Packet_Loss']}%
-- Network Availability: {input_data['Network_Availability']}%
-
-System Resource Metrics:
-- CPU Utilization: {input_data['CPU_Utilization']}%
-- Memory Usage: {input_data['Memory_Usage']}%
-- Grid Voltage: {input_data['Grid_Voltage']} V
-- Cooling Temperature: {input_data['Cooling_Temperature']}°C
-
-Network Traffic Analysis:
-- Network Traffic Volume: {input_data['Network_Traffic_Volume']} Mbps
-- Error Rates: {input_data['Error_Rates']}
-- Transmission Delay: {input_data['Transmission_Delay']} ms
-- Connection Establishment/Termination Times: {input_data['Connection_Establishment_Termination_Times']} ms
-
-System Diagnosis:
-- {diagnosis}
-
-Recommended Actions:
-{remediation}
-"""
-    return report
+    # Rendered from the precompiled template; diagnosis and remediation come from src.rules
+    return render_report(input_data, prediction)
+
+def ensure_report_columns(c):
+    """
+    Add the issue_status, issue_status_source and top_contributors columns to older reports tables
+    """
+    c.execute("PRAGMA table_info(reports)")
+    columns = [column[1] for column in c.fetchall()]
+    for column in ('issue_status', 'issue_status_source', 'top_contributors'):
+        if column not in columns:
+            try:
+                c.execute(f'ALTER TABLE reports ADD COLUMN {column} TEXT')
+            except sqlite3.OperationalError as e:
+                # Another session added it between the PRAGMA and the ALTER
+                if 'duplicate column' not in str(e):
+                    raise
+
 def save_report_to_db(input_data, prediction, report_text, feedback, model, username):
     """
-    Save system report to database with summarized feedback and status
+    Save system report to database with summarized feedback and status.
+    Returns the (summary_points, issue_status) stored with it.
     """
+    conn = None
     try:
         # Generate feedback summary and status
-        summary_points, issue_status = summarize_feedback(feedback, model)
+        summary_points, issue_status, status_source = summarize_feedback(feedback, model)
         
         # Format summary points as a string
         formatted_summary = "\n".join(f"• {point}" for point in summary_points)
@@ -300,22 +264,23 @@ def save_report_to_db(input_data, prediction, report_text, feedback, model, user
         # Add status to the feedback
         feedback_with_status = f"Status: {issue_status}\n\nKey Points:\n{formatted_summary}\n\nOriginal Feedback:\n{feedback}"
         
+        # Model attribution for the saved state, e.g. "Packet_Loss +0.214, Latency +0.097"
+        contributors_text = format_contributors(get_top_contributors(input_data, prediction))
+        
+        db_start = time.perf_counter()
         conn = sqlite3.connect('system_reports.db')
         c = conn.cursor()
         
-        # Modify the table to include issue_status if it doesn't exist
-        c.execute("PRAGMA table_info(reports)")
-        columns = [column[1] for column in c.fetchall()]
-        if 'issue_status' not in columns:
-            c.execute('ALTER TABLE reports ADD COLUMN issue_status TEXT')
+        ensure_report_columns(c)
         
         c.execute('''INSERT INTO reports 
                  (username, Date_and_Time, CPU_Utilization, Memory_Usage, Bandwidth_Utilization,
                   Throughput, Latency, Jitter, Packet_Loss, Error_Rates,
                   Connection_Establishment_Termination_Times, Network_Availability,
                   Transmission_Delay, Grid_Voltage, Cooling_Temperature,
-                  Network_Traffic_Volume, System_State, report_text, feedback, issue_status)
-                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+                  Network_Traffic_Volume, System_State, report_text, feedback, issue_status,
+                  issue_status_source, top_contributors)
+                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
                  (username,
                   datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                   input_data['CPU_Utilization'],
@@ -335,9 +300,16 @@ def save_report_to_db(input_data, prediction, report_text, feedback, model, user
                   prediction,
                   report_text,
                   feedback_with_status,
-                  issue_status))
+                  issue_status,
+                  status_source,
+                  contributors_text))
         
+        bump_generation(c)
         conn.commit()
+        observe('sqlite_seconds', time.perf_counter() - db_start, operation='save_report')
+        if feedback and status_source in TRAINING_LABEL_SOURCES:
+            record_labelled_feedback()
+        return summary_points, issue_status
     except sqlite3.Error as e:
         print(f"Database error: {e}")
         raise
@@ -345,23 +317,24 @@ def save_report_to_db(input_data, prediction, report_text, feedback, model, user
         print(f"Error saving report: {e}")
         raise
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
         
-def get_saved_reports():
-    conn = sqlite3.connect('system_reports.db')
-    reports = pd.read_sql_query("SELECT * FROM reports", conn)
-    conn.close()
-    return reports
-
+@timed('sqlite_seconds', operation='delete_report')
 def delete_report(report_id):
     conn = sqlite3.connect('system_reports.db')
     c = conn.cursor()
     c.execute("DELETE FROM reports WHERE id = ?", (report_id,))
+    bump_generation(c)
     conn.commit()
     conn.close()
 
 def show_prediction_tab():
    st.title("System Status Prediction")
+   input_mode = st.radio("Input mode:", ["Manual Input", "Live Telemetry"], horizontal=True)
+   if input_mode == "Live Telemetry":
+       show_live_telemetry()
+       return
    left_col, right_col = st.columns(2)
    
    with left_col:
@@ -447,6 +420,14 @@ def show_prediction_tab():
             else:
                 st.error(status)
             
+            contributors = get_top_contributors(st.session_state.current_input_data, status)
+            if contributors:
+                st.markdown("### Top Contributors:")
+                st.dataframe(pd.DataFrame(
+                    [{'Feature': feature, 'Value': st.session_state.current_input_data[feature],
+                      f'Contribution to {status}': round(contribution, 3)}
+                     for feature, contribution in contributors]), hide_index=True)
+            
             st.markdown("### Input Summary:")
             st.dataframe(pd.DataFrame([st.session_state.current_input_data]))
             
@@ -454,10 +435,99 @@ def show_prediction_tab():
                 st.session_state.current_tab = "Report Generator"
                 st.rerun()  
 
+def show_live_telemetry():
+    """Configure a local metric source and monitor it at a fixed refresh rate"""
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        source_type = st.selectbox("Metric source:", ["Stub Generator", "Tail File", "UDP Socket"])
+    with col2:
+        if source_type == "Tail File":
+            source_target = st.text_input("JSON-lines file path:", "telemetry.jsonl")
+        elif source_type == "UDP Socket":
+            source_target = st.number_input("UDP port:", min_value=1024, max_value=65535, value=9999)
+        else:
+            source_target = None
+    with col3:
+        refresh_seconds = st.number_input("Refresh every (s):", min_value=0.5, max_value=60.0, value=2.0)
+    buffer_size = st.slider("Samples kept per host:", min_value=60, max_value=5000, value=600, step=60)
+    
+    # Rebuild the source and monitor only when the configuration changes
+    config = (source_type, source_target, buffer_size)
+    if st.session_state.get('telemetry_config') != config:
+        if st.session_state.get('telemetry_source') is not None:
+            st.session_state.telemetry_source.close()
+        try:
+            if source_type == "Tail File":
+                source = FileTailSource(source_target)
+            elif source_type == "UDP Socket":
+                source = UDPSource(int(source_target))
+            else:
+                source = StubSource()
+        except OSError as e:
+            st.error(f"Could not open metric source: {e}")
+            st.session_state.telemetry_config = None
+            st.session_state.telemetry_source = None
+            return
+        st.session_state.telemetry_source = source
+        # Synthetic stub samples are shown but never written to the reports table
+        st.session_state.telemetry_monitor = TelemetryMonitor(capacity=buffer_size,
+                                                              persist=source_type != "Stub Generator")
+        st.session_state.telemetry_config = config
+    
+    st.fragment(run_every=refresh_seconds)(show_live_telemetry_panel)()
+
+def show_live_telemetry_panel():
+    monitor = st.session_state.telemetry_monitor
+    monitor.ingest(st.session_state.telemetry_source.poll())
+    
+    if not monitor.buffers:
+        st.info("Waiting for telemetry samples...")
+        return
+    
+    st.markdown("### Hosts")
+    host_rows = []
+    for host, buffer in sorted(monitor.buffers.items()):
+        timestamp, values, status = buffer.latest()
+        host_rows.append({
+            'Host': host,
+            'Status': STATUS_NAMES.get(status, "UNKNOWN"),
+            'Samples Buffered': buffer.count,
+            'Last Sample': datetime.fromtimestamp(timestamp).strftime("%H:%M:%S"),
+            **dict(zip(FEATURE_NAMES, values))
+        })
+    st.dataframe(pd.DataFrame(host_rows), hide_index=True)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        selected_host = st.selectbox("Host:", sorted(monitor.buffers))
+    with col2:
+        selected_metric = st.selectbox("Metric:", FEATURE_NAMES)
+    timestamps, values, statuses = monitor.buffers[selected_host].ordered()
+    chart_data = pd.DataFrame({selected_metric: values[:, FEATURE_NAMES.index(selected_metric)]},
+                              index=pd.to_datetime(timestamps, unit='s'))
+    st.line_chart(chart_data)
+    
+    if monitor.transitions:
+        st.markdown("### Recent State Transitions")
+        for host, _, previous, status in list(monitor.transitions)[-10:][::-1]:
+            st.write(f"{host}: {STATUS_NAMES.get(previous, 'UNKNOWN')} → {STATUS_NAMES.get(status, 'UNKNOWN')}")
+    if monitor.persist:
+        st.caption(f"{monitor.samples_seen} samples processed; only state transitions are saved to reports.")
+    else:
+        st.caption(f"{monitor.samples_seen} samples processed; stub samples are not saved to reports.")
+
 def show_report_generator_tab(username):
     if st.session_state.current_input_data and st.session_state.current_prediction:
-        report_text = generate_report_text(st.session_state.current_input_data, 
-                                           st.session_state.current_prediction)
+        # Keep the rendered text for this session's inputs so reruns don't change the
+        # text area's default (which would discard the user's edits)
+        report_key = (tuple(repr(st.session_state.current_input_data[name]) for name in FEATURE_NAMES),
+                      st.session_state.current_prediction)
+        cached_report = st.session_state.get('current_report')
+        if cached_report is None or cached_report[0] != report_key:
+            cached_report = (report_key, generate_report_text(st.session_state.current_input_data,
+                                                              st.session_state.current_prediction))
+            st.session_state.current_report = cached_report
+        report_text = cached_report[1]
         
         edited_report = st.text_area("Edit Report", report_text, height=400)
         
@@ -467,16 +537,15 @@ def show_report_generator_tab(username):
         
         if st.button("Save Report"):
             model = configure_genai()
-            save_report_to_db(st.session_state.current_input_data,
-                              st.session_state.current_prediction,
-                              edited_report,
-                              feedback,
-                              model,
-                              username)  # Pass username to save_report_to_db
+            summary_points, status = save_report_to_db(st.session_state.current_input_data,
+                                                       st.session_state.current_prediction,
+                                                       edited_report,
+                                                       feedback,
+                                                       model,
+                                                       username)  # Pass username to save_report_to_db
             st.success("Report saved successfully!")
             
             if feedback:
-                summary_points, status = summarize_feedback(feedback, model)
                 status_color = "green" if status == "RESOLVED" else "red"
                 
                 st.markdown(f"""
@@ -486,15 +555,24 @@ def show_report_generator_tab(username):
                     {''.join(f"<p>• {point}</p>" for point in summary_points)}
                 </div>
                 """, unsafe_allow_html=True)
+                st.caption(f"Feedback classified locally: {routing_stats['local']} | "
+                           f"sent to Gemini: {routing_stats['escalated']} "
+                           f"(escalation rate {escalation_rate():.0%})")
     else:
         st.warning("Please generate a prediction first!")
         
-def summarize_feedback(feedback_text, model):
+def summarize_feedback(feedback_text, model, use_local_classifier=True):
     """
-    Summarize feedback into bullet points and determine issue status using Gemini
+    Summarize feedback into bullet points and determine issue status using Gemini.
+    Returns (points, status, source), source being where the status came from.
     """
     if not feedback_text:
-        return [], "UNRESOLVED"
+        return [], "UNRESOLVED", LABEL_SOURCE_DEFAULT
+    
+    # Short, formulaic notes are classified locally; only uncertain ones reach Gemini
+    local_result = try_local_classification(feedback_text) if use_local_classifier else None
+    if local_result is not None:
+        return split_key_points(feedback_text), local_result[0], LABEL_SOURCE_LOCAL
         
     prompt = f"""
     Analyze this system feedback and determine if the issues described are RESOLVED or UNRESOLVED.
@@ -518,45 +596,168 @@ def summarize_feedback(feedback_text, model):
     """
     
     try:
-        response = model.generate_content(prompt)
-        content = response.text.strip()
+        with timer('llm_request_seconds', call='summarize_feedback'):
+            response = model.generate_content(prompt)
+        points, status, valid = parse_feedback_analysis(response.text.strip())
+        return points, status, LABEL_SOURCE_LLM if valid else LABEL_SOURCE_DEFAULT
         
-        # Split content into sections
-        sections = content.split('\n')
-        
-        # Extract status with explicit check
-        status_line = next((line for line in sections if line.startswith('STATUS:')), '')
-        status = "UNRESOLVED"  # Default to UNRESOLVED
-        
-        if "STATUS:" in status_line:
-            status_value = status_line.split('STATUS:')[1].strip().upper()
-            # Only set as RESOLVED if explicitly stated
-            if status_value == "RESOLVED":
-                status = "RESOLVED"
-        
-        # Extract bullet points
-        points = []
-        key_points_started = False
-        for line in sections:
-            if 'KEY POINTS:' in line:
-                key_points_started = True
-                continue
-            if key_points_started and line.strip().startswith('-'):
-                point = line.strip('- ').strip()
-                if point:
-                    points.append(point)
-        
-        # If no points were extracted, include the reasoning
-        if not points:
-            reasoning_line = next((line for line in sections if line.startswith('REASONING:')), '')
-            if reasoning_line:
-                points = [reasoning_line.split('REASONING:')[1].strip()]
+    except Exception as e:
+        st.error(f"Error summarizing feedback: {e}")
+        return [feedback_text], "UNRESOLVED", LABEL_SOURCE_DEFAULT
+
+def parse_feedback_analysis(content):
+    """
+    Parse a STATUS/REASONING/KEY POINTS block into (points, status, valid).
+    valid is False when the block has no explicit RESOLVED/UNRESOLVED status.
+    """
+    # Split content into sections
+    sections = content.split('\n')
+    
+    # Extract status with explicit check
+    status_line = next((line.strip() for line in sections if line.strip().startswith('STATUS:')), '')
+    status = "UNRESOLVED"  # Default to UNRESOLVED
+    valid = False
+    
+    if "STATUS:" in status_line:
+        status_value = status_line.split('STATUS:')[1].strip().strip('[]').upper()
+        valid = status_value in ("RESOLVED", "UNRESOLVED")
+        # Only set as RESOLVED if explicitly stated
+        if status_value == "RESOLVED":
+            status = "RESOLVED"
+    
+    # Extract bullet points
+    points = []
+    key_points_started = False
+    for line in sections:
+        if 'KEY POINTS:' in line:
+            key_points_started = True
+            continue
+        if key_points_started and line.strip().startswith('-'):
+            point = line.strip().strip('- ').strip()
+            if point:
+                points.append(point)
+    
+    # If no points were extracted, include the reasoning
+    if not points:
+        reasoning_line = next((line.strip() for line in sections if line.strip().startswith('REASONING:')), '')
+        if reasoning_line:
+            points = [reasoning_line.split('REASONING:')[1].strip()]
+    
+    return points, status, valid
+
+def summarize_feedback_batch(feedback_items, model):
+    """
+    Summarize many feedback notes in a single Gemini call.
+    feedback_items maps an id to its feedback text; returns {id: (points, status, source)}.
+    Items missing or unparseable in the batched response fall back to summarize_feedback.
+    """
+    results = {}
+    pending = {}
+    for item_id, feedback_text in feedback_items.items():
+        if not feedback_text:
+            results[item_id] = ([], "UNRESOLVED", LABEL_SOURCE_DEFAULT)
+            continue
+        local_result = try_local_classification(feedback_text)
+        if local_result is not None:
+            results[item_id] = (split_key_points(feedback_text), local_result[0], LABEL_SOURCE_LOCAL)
+        else:
+            pending[str(item_id)] = item_id
+    
+    if not pending:
+        return results
+    
+    items_block = "\n".join(
+        f"ITEM {key}:\n{feedback_items[item_id]}\nEND ITEM {key}\n"
+        for key, item_id in pending.items())
+    
+    prompt = f"""
+    Analyze each of the following system feedback notes independently and determine if the issues described are RESOLVED or UNRESOLVED.
+    
+    Rules for determining status:
+    - RESOLVED: Feedback indicates problems have been fixed, solutions implemented, or normal operation restored
+    - UNRESOLVED: Feedback describes ongoing issues, problems requiring attention, or pending actions
+    
+    If there's any uncertainty or ongoing issues mentioned, mark as UNRESOLVED.
+    
+    Feedback notes to analyze:
+    {items_block}
+    
+    Respond with one block per item, in this exact format, using the same item ids:
+    ITEM: [id]
+    STATUS: [RESOLVED/UNRESOLVED]
+    REASONING: [Brief explanation of status determination]
+    KEY POINTS:
+    - [point 1]
+    - [point 2]
+    etc.
+    """
+    
+    try:
+        with timer('llm_request_seconds', call='summarize_feedback_batch'):
+            response = model.generate_content(prompt)
+        content = response.text.strip()
         
-        return points, status
+        # Split the response into per-item blocks keyed by id
+        blocks = {}
+        current_key = None
+        for line in content.split('\n'):
+            stripped = line.strip()
+            if stripped.startswith('ITEM:'):
+                current_key = stripped.split('ITEM:')[1].strip().strip('[]')
+                blocks[current_key] = []
+            elif current_key is not None:
+                blocks[current_key].append(stripped)
         
+        for key, item_id in list(pending.items()):
+            if key not in blocks:
+                continue
+            points, status, valid = parse_feedback_analysis('\n'.join(blocks[key]))
+            if valid:
+                results[item_id] = (points, status, LABEL_SOURCE_LLM)
+                del pending[key]
     except Exception as e:
-        st.error(f"Error summarizing feedback: {e}")
-        return [feedback_text], "UNRESOLVED"
+        print(f"Error summarizing feedback batch: {e}")
+    
+    # Fall back to one call per item for anything the batch didn't answer cleanly
+    for item_id in pending.values():
+        results[item_id] = summarize_feedback(feedback_items[item_id], model, use_local_classifier=False)
+    
+    return results
+
+def backfill_issue_status(model, batch_size=20):
+    """
+    Classify stored reports that have feedback but no issue_status, batch_size notes per call
+    """
+    conn = sqlite3.connect('system_reports.db')
+    c = conn.cursor()
+    try:
+        ensure_report_columns(c)
+        conn.commit()
+        # live:<host> rows from older versions carry a generated transition note, not operator feedback
+        c.execute("""SELECT id, feedback FROM reports 
+                     WHERE issue_status IS NULL AND feedback IS NOT NULL AND feedback != ''
+                     AND username NOT LIKE 'live:%'""")
+        rows = c.fetchall()
+        
+        updated = 0
+        for start in range(0, len(rows), batch_size):
+            batch = dict(rows[start:start + batch_size])
+            results = summarize_feedback_batch(batch, model)
+            for report_id, (summary_points, issue_status, status_source) in results.items():
+                formatted_summary = "\n".join(f"• {point}" for point in summary_points)
+                feedback_with_status = f"Status: {issue_status}\n\nKey Points:\n{formatted_summary}\n\nOriginal Feedback:\n{batch[report_id]}"
+                c.execute("""UPDATE reports SET feedback = ?, issue_status = ?, issue_status_source = ?
+                             WHERE id = ?""",
+                          (feedback_with_status, issue_status, status_source, report_id))
+                updated += 1
+            bump_generation(c)
+            conn.commit()
+        return updated
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+        raise
+    finally:
+        conn.close()
 
 def preview_feedback_status(feedback, summary_points, status):
     """
@@ -602,213 +803,268 @@ def show_reports_tab(current_username):
     if issue_status_filter:
         filtered_reports = filtered_reports[filtered_reports['issue_status'].isin(issue_status_filter)]
 
-    def summarize_feedback(feedback_text):
-        """Convert feedback text into bullet points"""
-        sentences = [s.strip() for s in feedback_text.split('.') if s.strip()]
-        key_points = []
-        for sentence in sentences[:3]:
-            point = sentence.strip().replace('\n', ' ')
-            if point:
-                key_points.append(point)
-        return key_points
+    show_export_panel(status_filter, issue_status_filter)
 
-    def get_trust_warning(trust_score, total_votes):
-        """Return appropriate warning message based on trust score and vote count"""
-        trust_color = "green"  # Default color for trust score
-        warning_message = ""
-        warning_icon = ""
+    # Rows updated by votes in the previous fragment runs are superseded by this full read
+    for key in [key for key in st.session_state.keys() if str(key).startswith("report_row_")]:
+        del st.session_state[key]
 
-        if total_votes >= 10:  # Significant number of votes
-            if trust_score < 40:  # Adjusted threshold for large number of votes
-                trust_color = "red"
-                warning_message = "This report has been flagged as potentially unreliable by multiple users."
-                warning_icon = "🚫 Highly Untrusted Report"
-            elif trust_score < 60:  # Moderate threshold for large number of votes
-                trust_color = "orange"
-                warning_message = "This report has received mixed feedback from users."
-                warning_icon = "⚠️ Low Trust Report"
-        elif total_votes >= 5:  # Moderate number of votes
-            if trust_score < 50:  # Adjusted threshold for smaller number of votes
-                trust_color = "red"
-                warning_message = "This report has received several negative ratings."
-                warning_icon = "⚠️ Warning: Low Trust Score"
+    # Display reports in an expandable format; each card is its own fragment so
+    # voting or deleting reruns only that card
+    with timer('render_seconds', view='reports_tab'):
+        for idx, report in filtered_reports.iterrows():
+            show_report_card(report, current_username)
+
+def show_export_panel(status_filter, issue_status_filter):
+    """Download button for a chunked export using the current state filters plus a date range"""
+    with st.expander("Export Reports"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            start_date = st.date_input("From:", value=None)
+        with col2:
+            end_date = st.date_input("To:", value=None)
+        with col3:
+            export_format = st.selectbox("Format:", list(EXPORT_FORMATS))
+        filters = {'start_date': start_date, 'end_date': end_date,
+                   'states': status_filter, 'issue_statuses': issue_status_filter}
+        cli_hint = "`cd src && PYTHONPATH=.. python -m src.export`, which writes straight to disk"
+        
+        row_count = count_export_rows(**filters)
+        if row_count > UI_EXPORT_MAX_ROWS:
+            st.warning(f"{row_count} reports match, more than the {UI_EXPORT_MAX_ROWS} that can be "
+                       f"downloaded here. Narrow the filters or use {cli_hint}.")
+            return
+        
+        def build_export():
+            # Runs only when the button is clicked; rows are streamed from SQLite in chunks
+            path = export_to_tempfile(export_format, **filters)
+            try:
+                with open(path, 'rb') as f:
+                    return f.read()
+            finally:
+                os.remove(path)
+        
+        st.download_button("Download", data=build_export, file_name=f"reports{EXPORT_FORMATS[export_format]}",
+                           key="export_download")
+        st.caption(f"{row_count} reports match. For very large histories use {cli_hint}.")
 
-        return warning_icon, trust_color, warning_message
+def get_trust_warning(trust_score, total_votes):
+    """Return appropriate warning message based on trust score and vote count"""
+    trust_color = "green"  # Default color for trust score
+    warning_message = ""
+    warning_icon = ""
 
-    # Display reports in an expandable format
-    for idx, report in filtered_reports.iterrows():
-        system_state_color = {
-            "NORMAL": "green",
-            "WARNING": "orange",
-            "CRITICAL": "red"
-        }.get(report['System_State'], "gray")
-        
-        issue_status = report.get('issue_status', 'UNRESOLVED')
-        issue_color = "green" if issue_status == "RESOLVED" else "red"
-        
-        total_votes = report['upvotes'] + report['downvotes']
-        trust_score = (report['upvotes'] / total_votes * 100) if total_votes > 0 else 100
-        
-        trust_warning, trust_color, _ = get_trust_warning(trust_score, total_votes)
-        
-        # Display header with system state and issue status
-        header = (
-            f"<div style='display: flex; flex-direction: column; padding: 10px;'>"
-            f"<div style='display: flex; justify-content: space-between; align-items: center;'>"
-            f"<div>"
-            f"<span style='font-weight: bold; margin-right: 15px;'>Report by: {report['username']}</span>"
-            f"<span>Date: {report['Date_and_Time']}</span>"
-            f"</div>"
-            f"<div>"
-            f"<span style='color: {system_state_color}; margin-right: 15px;'>System: {report['System_State']}</span>"
-            f"<span style='color: {issue_color};'>Status: {issue_status}</span>"
-            f"</div>"
+    if total_votes >= 10:  # Significant number of votes
+        if trust_score < 40:  # Adjusted threshold for large number of votes
+            trust_color = "red"
+            warning_message = "This report has been flagged as potentially unreliable by multiple users."
+            warning_icon = "🚫 Highly Untrusted Report"
+        elif trust_score < 60:  # Moderate threshold for large number of votes
+            trust_color = "orange"
+            warning_message = "This report has received mixed feedback from users."
+            warning_icon = "⚠️ Low Trust Report"
+    elif total_votes >= 5:  # Moderate number of votes
+        if trust_score < 50:  # Adjusted threshold for smaller number of votes
+            trust_color = "red"
+            warning_message = "This report has received several negative ratings."
+            warning_icon = "⚠️ Warning: Low Trust Score"
+
+    return warning_icon, trust_color, warning_message
+
+def handle_vote(report_id, username, vote_type):
+    """Button callback: apply the vote and keep the updated row for the card's fragment rerun"""
+    updated_row = update_vote(report_id, username, vote_type)
+    if updated_row is not None:
+        st.session_state[f"report_row_{report_id}"] = updated_row
+
+def handle_delete(report_id):
+    """Button callback: delete the report and mark its card as removed"""
+    delete_report(report_id)
+    st.session_state[f"report_row_{report_id}"] = None
+
+@st.fragment
+@timed('render_seconds', view='report_card')
+def show_report_card(report, current_username):
+    """Render one saved report; its buttons rerun only this fragment"""
+    row_key = f"report_row_{report['id']}"
+    if row_key in st.session_state:
+        report = st.session_state[row_key]
+        if report is None:
+            st.success("Report deleted successfully!")
+            return
+    
+    system_state_color = {
+        "NORMAL": "green",
+        "WARNING": "orange",
+        "CRITICAL": "red"
+    }.get(report['System_State'], "gray")
+    
+    issue_status = report.get('issue_status', 'UNRESOLVED')
+    issue_color = "green" if issue_status == "RESOLVED" else "red"
+    
+    total_votes = report['upvotes'] + report['downvotes']
+    trust_score = (report['upvotes'] / total_votes * 100) if total_votes > 0 else 100
+    
+    warning_icon, warning_color, warning_message = get_trust_warning(trust_score, total_votes)
+    
+    # Display header with system state and issue status
+    header = (
+        f"<div style='display: flex; flex-direction: column; padding: 10px;'>"
+        f"<div style='display: flex; justify-content: space-between; align-items: center;'>"
+        f"<div>"
+        f"<span style='font-weight: bold; margin-right: 15px;'>Report by: {report['username']}</span>"
+        f"<span>Date: {report['Date_and_Time']}</span>"
+        f"</div>"
+        f"<div>"
+        f"<span style='color: {system_state_color}; margin-right: 15px;'>System: {report['System_State']}</span>"
+        f"<span style='color: {issue_color};'>Status: {issue_status}</span>"
+        f"</div>"
+        f"</div>"
+    )
+    
+    # Add trust warning if necessary
+    if warning_icon:
+        header += (
+            f"<div style='margin-top: 10px; padding: 8px; background-color: rgba(255,0,0,0.1); "
+            f"border-left: 4px solid {warning_color}; margin-bottom: 10px;'>"
+            f"<span style='color: {warning_color}; font-weight: bold;'>{warning_icon}</span> "
+            f"<span style='color: {warning_color};'>{warning_message}</span>"
             f"</div>"
         )
+    
+    header += "</div>"
+    
+    st.markdown(header, unsafe_allow_html=True)
+    
+    # Add voting buttons and display vote counts
+    col1, col2, col3 = st.columns([1, 1, 8])
+    with col1:
+        st.button("👍", key=f"upvote_{report['id']}", on_click=handle_vote,
+                  args=(report['id'], current_username, 'upvote'))
+        st.write(f"{report['upvotes']} upvotes")
         
-        # Add trust warning if necessary
-        if trust_warning:
-            warning_icon, warning_color, warning_message = trust_warning
-            header += (
-                f"<div style='margin-top: 10px; padding: 8px; background-color: rgba(255,0,0,0.1); "
-                f"border-left: 4px solid {warning_color}; margin-bottom: 10px;'>"
-                f"<span style='color: {warning_color}; font-weight: bold;'>{warning_icon}</span> "
-                f"<span style='color: {warning_color};'>{warning_message}</span>"
-                f"</div>"
-            )
-        
-        header += "</div>"
-        
-        st.markdown(header, unsafe_allow_html=True)
+    with col2:
+        st.button("👎", key=f"downvote_{report['id']}", on_click=handle_vote,
+                  args=(report['id'], current_username, 'downvote'))
+        st.write(f"{report['downvotes']} downvotes")
+    
+    # Add trust score bar using custom styling
+    if total_votes >= 4:
+        trust_score = (report['upvotes'] / total_votes) * 100
+        with col3:
+            # Assign color based on trust score
+            if trust_score < 50:
+                trust_color = "red"
+            elif trust_score < 60:
+                trust_color = "orange"
+            else:
+                trust_color = "green"
+
+            # Create a custom progress bar with dynamic color
+            st.markdown(f"""
+                <div style="height: 20px; width: 100%; background-color: #e0e0e0; border-radius: 5px;">
+                    <div style="height: 100%; width: {trust_score}%; background-color: {trust_color}; border-radius: 5px;"></div>
+                </div>
+            """, unsafe_allow_html=True)
+            st.write(f"Trust Score: {trust_score:.1f}% ({total_votes} votes)")
+    
+    with st.expander("View Details"):
+        # System Metrics Section
+        st.markdown("### System Metrics")
+        col1, col2 = st.columns(2)
         
-        # Add voting buttons and display vote counts
-        col1, col2, col3 = st.columns([1, 1, 8])
         with col1:
-            if st.button("👍", key=f"upvote_{report['id']}"):
-                if update_vote(report['id'], current_username, 'upvote'):
-                    st.rerun()
-            st.write(f"{report['upvotes']} upvotes")
-            
+            metrics = {
+                "CPU Utilization": f"{report['CPU_Utilization']}%",
+                "Memory Usage": f"{report['Memory_Usage']}%",
+                "Grid Voltage": f"{report['Grid_Voltage']} V",
+                "Cooling Temperature": f"{report['Cooling_Temperature']}°C"
+            }
+            for label, value in metrics.items():
+                st.markdown(f"**{label}:** {value}")
+        
         with col2:
-            if st.button("👎", key=f"downvote_{report['id']}"):
-                if update_vote(report['id'], current_username, 'downvote'):
-                    st.rerun()
-            st.write(f"{report['downvotes']} downvotes")
-        
-        # Add trust score bar using custom styling
-        if total_votes >= 4:
-            trust_score = (report['upvotes'] / total_votes) * 100
-            with col3:
-                # Assign color based on trust score
-                if trust_score < 50:
-                    trust_color = "red"
-                elif trust_score < 60:
-                    trust_color = "orange"
-                else:
-                    trust_color = "green"
+            metrics = {
+                "Network Traffic Volume": f"{report['Network_Traffic_Volume']} Mbps",
+                "Error Rates": f"{report['Error_Rates']}%",
+                "Network Availability": f"{report['Network_Availability']}%"
+            }
+            for label, value in metrics.items():
+                st.markdown(f"**{label}:** {value}")
 
-                # Create a custom progress bar with dynamic color
-                st.markdown(f"""
-                    <div style="height: 20px; width: 100%; background-color: #e0e0e0; border-radius: 5px;">
-                        <div style="height: 100%; width: {trust_score}%; background-color: {trust_color}; border-radius: 5px;"></div>
-                    </div>
-                """, unsafe_allow_html=True)
-                st.write(f"Trust Score: {trust_score:.1f}% ({total_votes} votes)")
+        # Network Metrics Section
+        st.markdown("### Network Metrics")
+        col3, col4 = st.columns(2)
         
-        with st.expander("View Details"):
-            # System Metrics Section
-            st.markdown("### System Metrics")
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                metrics = {
-                    "CPU Utilization": f"{report['CPU_Utilization']}%",
-                    "Memory Usage": f"{report['Memory_Usage']}%",
-                    "Grid Voltage": f"{report['Grid_Voltage']} V",
-                    "Cooling Temperature": f"{report['Cooling_Temperature']}°C"
-                }
-                for label, value in metrics.items():
-                    st.markdown(f"**{label}:** {value}")
-            
-            with col2:
-                metrics = {
-                    "Network Traffic Volume": f"{report['Network_Traffic_Volume']} Mbps",
-                    "Error Rates": f"{report['Error_Rates']}%",
-                    "Network Availability": f"{report['Network_Availability']}%"
-                }
-                for label, value in metrics.items():
-                    st.markdown(f"**{label}:** {value}")
-
-            # Network Metrics Section
-            st.markdown("### Network Metrics")
-            col3, col4 = st.columns(2)
+        with col3:
+            metrics = {
+                "Bandwidth Utilization": f"{report['Bandwidth_Utilization']} Mbps",
+                "Throughput": f"{report['Throughput']} Mbps",
+                "Latency": f"{report['Latency']} ms",
+                "Jitter": f"{report['Jitter']} ms"
+            }
+            for label, value in metrics.items():
+                st.markdown(f"**{label}:** {value}")
+        
+        with col4:
+            metrics = {
+                "Packet Loss": f"{report['Packet_Loss']}%",
+                "Connection Times": f"{report['Connection_Establishment_Termination_Times']} ms",
+                "Transmission Delay": f"{report['Transmission_Delay']} ms"
+            }
+            for label, value in metrics.items():
+                st.markdown(f"**{label}:** {value}")
+
+        # Model attribution stored when the report was saved
+        if pd.notna(report.get('top_contributors')) and report.get('top_contributors'):
+            st.markdown("### Top Contributors")
+            st.markdown(report['top_contributors'])
+
+        # Full Report Section
+        if report['report_text']:
+            st.markdown("### Full Report")
+            report_html = f"{report['report_text'].replace(chr(10), '<br>')}"
+            st.markdown(report_html, unsafe_allow_html=True)
+
+        # Feedback Section
+        if 'feedback' in report and pd.notna(report['feedback']):
+            st.markdown("### Feedback Analysis")
             
-            with col3:
-                metrics = {
-                    "Bandwidth Utilization": f"{report['Bandwidth_Utilization']} Mbps",
-                    "Throughput": f"{report['Throughput']} Mbps",
-                    "Latency": f"{report['Latency']} ms",
-                    "Jitter": f"{report['Jitter']} ms"
-                }
-                for label, value in metrics.items():
-                    st.markdown(f"**{label}:** {value}")
+            original_feedback = report['feedback']
+            if 'Original Feedback:' in original_feedback:
+                feedback_parts = original_feedback.split('Original Feedback:')
+                summary_text = feedback_parts[0]
+                original_text = feedback_parts[1] if len(feedback_parts) > 1 else ''
+            else:
+                summary_text = original_feedback
+                original_text = ''
+
+            # Generate bullet-point summary
+            key_points = split_key_points(summary_text)
             
-            with col4:
-                metrics = {
-                    "Packet Loss": f"{report['Packet_Loss']}%",
-                    "Connection Times": f"{report['Connection_Establishment_Termination_Times']} ms",
-                    "Transmission Delay": f"{report['Transmission_Delay']} ms"
-                }
-                for label, value in metrics.items():
-                    st.markdown(f"**{label}:** {value}")
-
-            # Full Report Section
-            if report['report_text']:
-                st.markdown("### Full Report")
-                report_html = f"{report['report_text'].replace(chr(10), '<br>')}"
-                st.markdown(report_html, unsafe_allow_html=True)
-
-            # Feedback Section
-            if 'feedback' in report and pd.notna(report['feedback']):
-                st.markdown("### Feedback Analysis")
-                
-                original_feedback = report['feedback']
-                if 'Original Feedback:' in original_feedback:
-                    feedback_parts = original_feedback.split('Original Feedback:')
-                    summary_text = feedback_parts[0]
-                    original_text = feedback_parts[1] if len(feedback_parts) > 1 else ''
-                else:
-                    summary_text = original_feedback
-                    original_text = ''
+            summary_html = (
+                f"<div style='border-left: 5px solid {issue_color}; padding-left: 15px;'>"
+                "<ul style='margin: 0; padding-left: 20px;'>"
+            )
+            for point in key_points:
+                summary_html += f"<li>{point}</li>"
+            summary_html += "</ul></div>"
+                                
+            st.markdown(summary_html, unsafe_allow_html=True)
 
-                # Generate bullet-point summary
-                key_points = summarize_feedback(summary_text)
+    # Original Feedback Section (at same level as main expander)
+    if 'feedback' in report and pd.notna(report['feedback']):
+        with st.expander("View Original Feedback"):
+            if original_text:
+                st.markdown(original_text)
+            else:
+                st.markdown(original_feedback)
                 
-                summary_html = (
-                    f"<div style='border-left: 5px solid {issue_color}; padding-left: 15px;'>"
-                    "<ul style='margin: 0; padding-left: 20px;'>"
-                )
-                for point in key_points:
-                    summary_html += f"<li>{point}</li>"
-                summary_html += "</ul></div>"
-                                    
-                st.markdown(summary_html, unsafe_allow_html=True)
-
-        # Original Feedback Section (at same level as main expander)
-        if 'feedback' in report and pd.notna(report['feedback']):
-            with st.expander("View Original Feedback"):
-                if original_text:
-                    st.markdown(original_text)
-                else:
-                    st.markdown(original_feedback)
-                    
-        # Delete button moved here, after the View Original Feedback expander
-        if st.button("Delete Report", key=f"delete_{report['id']}", type="secondary"):
-            delete_report(report['id'])
-            st.success("Report deleted successfully!")
-            st.rerun()
+    # Delete button moved here, after the View Original Feedback expander
+    st.button("Delete Report", key=f"delete_{report['id']}", type="secondary",
+              on_click=handle_delete, args=(report['id'],))
 
-        st.markdown("---")  # Add separator between reports
+    st.markdown("---")  # Add separator between reports
 
         
 def show_qa_tab(model):
@@ -847,9 +1103,13 @@ def show_qa_tab(model):
                 st.warning("No historical reports found in the database.")
                 return
                 
+            # Evaluate threshold rules for every stored report in one pass
+            rule_masks = evaluate_rules(reports.fillna(0))
+            
             # Format historical data
             historical_context = "\nHistorical Reports:\n"
             for idx, report in reports.iterrows():
+                breaches = "; ".join(issues_for(rule_masks[idx])) or "None"
                 historical_context += f"""
                 Report {idx + 1} - {report['Date_and_Time']}:
                 System State: {report['System_State']}
@@ -859,6 +1119,7 @@ def show_qa_tab(model):
                 Network Traffic Volume: {report['Network_Traffic_Volume']} Mbps
                 Error Rates: {report['Error_Rates']}%
                 Network Availability: {report['Network_Availability']}%
+                Threshold Breaches: {breaches}
                 """
             
             context_data = historical_context
@@ -883,13 +1144,7 @@ def show_qa_tab(model):
         {context_data}
 
         The system is considered abnormal if any of these conditions are met:
-        - CPU Utilization >= 80%
-        - Memory Usage >= 80%
-        - Latency >= 200 ms
-        - Packet Loss >= 1%
-        - Error Rates >= 5%
-        - Transmission Delay >= 100 ms
-        - Network Availability < 99.9%
+{describe_rules()}
 
         When analyzing trends or comparing data, please consider both historical and current data if available.
         Please provide a natural, conversational response to this question: {user_question}
@@ -900,17 +1155,57 @@ def show_qa_tab(model):
         """
         
         try:
+            st.markdown("### Answer:")
+            answer_placeholder = st.empty()
             with st.spinner("Analyzing data and generating response..."):
-                response = model.generate_content(system_context)
-                cleaned_response = response.text.replace('*', '').strip()
-                st.markdown("### Answer:")
-                st.write(cleaned_response)
+                cleaned_response, timings = stream_response(model, system_context, answer_placeholder)
+            answer_placeholder.write(cleaned_response)
+            st.caption(f"First token: {timings['time_to_first_token']:.2f}s | "
+                       f"Total generation: {timings['total_time']:.2f}s")
                 
         except Exception as e:
             st.error(f"Error generating response: {str(e)}")
 
+# Most recent Q&A generation timings kept per session
+QA_TIMINGS_KEPT = 50
+
+def stream_response(model, prompt, placeholder):
+    """
+    Stream a Gemini response into a placeholder and record generation timings.
+    Changing the question triggers a rerun, which interrupts the loop at the next
+    placeholder update; the rest of the stream is no longer read (the request itself is
+    not cancelled) and the timings are logged as cancelled.
+    """
+    start = time.perf_counter()
+    timings = {'time_to_first_token': None, 'total_time': None, 'cancelled': True}
+    text = ""
+    response = model.generate_content(prompt, stream=True)
+    try:
+        for chunk in response:
+            if timings['time_to_first_token'] is None:
+                timings['time_to_first_token'] = time.perf_counter() - start
+            text += chunk.text.replace('*', '')
+            placeholder.markdown(text + "▌")
+        timings['cancelled'] = False
+    finally:
+        timings['total_time'] = time.perf_counter() - start
+        if timings['time_to_first_token'] is None:
+            timings['time_to_first_token'] = timings['total_time']
+        if 'qa_timings' not in st.session_state:
+            st.session_state.qa_timings = deque(maxlen=QA_TIMINGS_KEPT)
+        st.session_state.qa_timings.append(timings)
+        if not timings['cancelled']:
+            observe('llm_request_seconds', timings['total_time'], call='qa_stream')
+            observe('llm_time_to_first_token_seconds', timings['time_to_first_token'], call='qa_stream')
+        del response
+    return text.strip(), timings
+
 def get_saved_reports():
-    """Helper function to get reports from database"""
+    """Helper function to get reports from database, shared across sessions until the next write"""
+    return cached_read('reports', load_reports_from_db)
+
+@timed('sqlite_seconds', operation='load_reports')
+def load_reports_from_db():
     conn = sqlite3.connect('system_reports.db')
     try:
         reports = pd.read_sql_query("SELECT * FROM reports", conn)
@@ -921,6 +1216,47 @@ def get_saved_reports():
     finally:
         conn.close()
 
+def get_admin_users():
+    """Usernames allowed to see the admin panel, from the comma-separated ADMIN_USERS variable"""
+    return {name.strip() for name in os.getenv('ADMIN_USERS', '').split(',') if name.strip()}
+
+def show_admin_panel():
+    with st.sidebar.expander("Admin: Cache Stats"):
+        total_reads = cache_stats['hits'] + cache_stats['misses']
+        hit_rate = cache_stats['hits'] / total_reads if total_reads else 0.0
+        st.write(f"Database generation: {get_generation()}")
+        st.write(f"Hits: {cache_stats['hits']} | Misses: {cache_stats['misses']} | "
+                 f"Invalidations: {cache_stats['invalidations']}")
+        st.write(f"Hit rate: {hit_rate:.0%}")
+    
+    with st.sidebar.expander("Admin: Feature Drift"):
+        drift_scores = pd.DataFrame(get_drift_monitor().scores())
+        if drift_scores['count'].iloc[0] == 0:
+            st.write("No predictions observed in the current hour yet.")
+        else:
+            drifted = drift_scores.loc[drift_scores['drifted'], 'feature'].tolist()
+            st.write(f"Drifted features: {', '.join(drifted) if drifted else 'None'}")
+            st.dataframe(drift_scores[['feature', 'mean_shift', 'std_ratio', 'p50', 'psi']].round(2),
+                         hide_index=True)
+    
+    with st.sidebar.expander("Admin: Feedback Backfill"):
+        st.write("Classify saved reports whose feedback has no issue status yet, "
+                 "several notes per Gemini call.")
+        batch_size = st.number_input("Notes per call:", min_value=1, max_value=50, value=20)
+        if st.button("Backfill issue status"):
+            with st.spinner("Classifying feedback..."):
+                updated = backfill_issue_status(configure_genai(), int(batch_size))
+            st.success(f"Updated {updated} reports.")
+    
+    with st.sidebar.expander("Admin: Metrics"):
+        rows = summary_rows()
+        if not rows:
+            st.write("No timings recorded yet (set METRICS_ENABLED=0 to disable collection).")
+        else:
+            st.dataframe(pd.DataFrame(rows).round(2), hide_index=True)
+        st.download_button("Download Prometheus metrics", data=render_prometheus,
+                           file_name="metrics.prom", mime="text/plain")
+
 def main(username):
     st.set_page_config(page_title="System Status Predictor", layout="wide")
     
@@ -934,9 +1270,19 @@ def main(username):
     if 'current_prediction' not in st.session_state:
         st.session_state.current_prediction = None
     
-    # Initialize database and model
+    # Initialize database
     create_database()
-    model = configure_genai()
+    
+    # Optional local /metrics endpoint for Prometheus scraping
+    metrics_port = os.getenv('METRICS_PORT')
+    if metrics_port:
+        try:
+            start_metrics_server(int(metrics_port))
+        except OSError as e:
+            print(f"Metrics server error: {e}")
+    
+    if username in get_admin_users():
+        show_admin_panel()
     
     # Tab selection
     tab_options = ["Prediction", "Report Generator", "Q&A", "View Reports"]
@@ -948,6 +1294,6 @@ def main(username):
     elif st.session_state.current_tab == "Report Generator":
         show_report_generator_tab(username)
     elif st.session_state.current_tab == "Q&A":
-        show_qa_tab(model)
+        show_qa_tab(configure_genai())
     elif st.session_state.current_tab == "View Reports":
         show_reports_tab(username)
\ No newline at end of file
@@ -0,0 +1,207 @@
+import bisect
+import functools
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Lightweight in-process metrics: counters and fixed-bucket histograms, exported in the
+# Prometheus text format. Set METRICS_ENABLED=0 to turn every timer and counter into a
+# no-op; decorators then return the undecorated function.
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', '1') != '0'
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+_counters = {}    # (name, labels) -> value
+_histograms = {}  # (name, labels) -> [bucket counts..., +Inf count], sum, count
+_descriptions = {}
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+def describe(name, text):
+    """
+    Set the HELP text for a metric
+    """
+    _descriptions[name] = text
+
+def increment(name, value=1, **labels):
+    if not METRICS_ENABLED:
+        return
+    key = (name, _label_key(labels))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+def observe(name, value, **labels):
+    """
+    Record one histogram observation (seconds for timers)
+    """
+    if not METRICS_ENABLED:
+        return
+    key = (name, _label_key(labels))
+    index = bisect.bisect_left(DEFAULT_BUCKETS, value)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = [[0] * (len(DEFAULT_BUCKETS) + 1), 0.0, 0]
+        histogram[0][index] += 1
+        histogram[1] += value
+        histogram[2] += 1
+
+class _Timer:
+    __slots__ = ('name', 'labels', 'start')
+
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        observe(self.name, time.perf_counter() - self.start, **self.labels)
+        if exc_type is not None:
+            increment(self.name + '_errors_total', **self.labels)
+        return False
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+def timer(name, **labels):
+    """
+    Context manager that records the block's duration in the `name` histogram
+    """
+    if not METRICS_ENABLED:
+        return _NULL_TIMER
+    return _Timer(name, labels)
+
+def timed(name, **labels):
+    """
+    Decorator form of timer()
+    """
+    def decorator(func):
+        if not METRICS_ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _Timer(name, labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def snapshot():
+    """
+    Copy of current values: (counters, histograms) keyed by (name, labels)
+    """
+    with _lock:
+        counters = dict(_counters)
+        histograms = {key: (list(value[0]), value[1], value[2]) for key, value in _histograms.items()}
+    return counters, histograms
+
+def summary_rows():
+    """
+    One row per histogram with count, mean and bucket-estimated p50/p95, for the admin panel
+    """
+    _, histograms = snapshot()
+    rows = []
+    for (name, labels), (buckets, total, count) in sorted(histograms.items()):
+        row = {'metric': name, 'labels': ", ".join(f"{k}={v}" for k, v in labels),
+               'count': count, 'mean_ms': total / count * 1000 if count else 0.0}
+        for quantile in (0.5, 0.95):
+            target, cumulative = quantile * count, 0
+            bound = float('inf')
+            for upper, bucket_count in zip(DEFAULT_BUCKETS + (float('inf'),), buckets):
+                cumulative += bucket_count
+                if cumulative >= target:
+                    bound = upper
+                    break
+            row[f"p{int(quantile * 100)}_ms_le"] = bound * 1000
+        rows.append(row)
+    return rows
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    escaped = []
+    for key, value in pairs:
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        escaped.append(f'{key}="{value}"')
+    return "{" + ",".join(escaped) + "}"
+
+def render_prometheus():
+    """
+    All metrics in the Prometheus text exposition format
+    """
+    counters, histograms = snapshot()
+    lines = []
+    seen = set()
+    for (name, labels), value in sorted(counters.items()):
+        if name not in seen:
+            seen.add(name)
+            if name in _descriptions:
+                lines.append(f"# HELP {name} {_descriptions[name]}")
+            lines.append(f"# TYPE {name} counter")
+        lines.append(f"{name}{_format_labels(labels)} {value}")
+    for (name, labels), (buckets, total, count) in sorted(histograms.items()):
+        if name not in seen:
+            seen.add(name)
+            if name in _descriptions:
+                lines.append(f"# HELP {name} {_descriptions[name]}")
+            lines.append(f"# TYPE {name} histogram")
+        cumulative = 0
+        for upper, bucket_count in zip(DEFAULT_BUCKETS + (float('inf'),), buckets):
+            cumulative += bucket_count
+            le = "+Inf" if upper == float('inf') else repr(upper)
+            lines.append(f"{name}_bucket{_format_labels(labels, [('le', le)])} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {total}")
+        lines.append(f"{name}_count{_format_labels(labels)} {count}")
+    return "\n".join(lines) + "\n"
+
+def write_prometheus_file(path):
+    """
+    Atomically write the exposition text, e.g. for node_exporter's textfile collector
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(render_prometheus())
+    os.replace(tmp_path, path)
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip('/') != '/metrics':
+            self.send_error(404)
+            return
+        body = render_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+_server = None
+
+def start_metrics_server(port, host='127.0.0.1'):
+    """
+    Serve /metrics on a background thread; calling it again is a no-op
+    """
+    global _server
+    with _lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            threading.Thread(target=_server.serve_forever, daemon=True).start()
+    return _server
@@ -1,5 +1,41 @@
-import joblib
-from sklearn.preprocessing import StandardScaler
+import os
+import threading
+import numpy as np
+from src.drift import DriftMonitor
+from src.attribution import ForestExplainer, is_explainable
+from src.metrics import timer
+
+MODELS_DIR = '../Models'
+
+# Feature order expected by the scaler and model
+FEATURE_NAMES = [
+    'CPU_Utilization',
+    'Memory_Usage',
+    'Bandwidth_Utilization',
+    'Throughput',
+    'Latency',
+    'Jitter',
+    'Packet_Loss',
+    'Error_Rates',
+    'Connection_Establishment_Termination_Times',
+    'Network_Availability',
+    'Transmission_Delay',
+    'Grid_Voltage',
+    'Cooling_Temperature',
+    'Network_Traffic_Volume'
+]
+
+STATUS_NAMES = {0: "NORMAL", 1: "WARNING", 2: "CRITICAL"}
+
+# variant name (None for the default model) -> (version, model, scaler)
+_loaded = {}
+_loaded_lock = threading.Lock()
+
+# Live inputs are compared against the training statistics of the scaler in use;
+# set DRIFT_MONITOR=0 to switch this off
+DRIFT_MONITOR_ENABLED = os.getenv('DRIFT_MONITOR', '1') != '0'
+_drift = {'scaler': None, 'monitor': None}
+_explainer = {'model': None, 'explainer': None}
 
 def predict(CPU_Utilization, Memory_Usage, Bandwidth_Utilization,
             Throughput, Latency, Jitter, Packet_Loss, Error_Rates,
@@ -13,10 +49,6 @@ def predict(CPU_Utilization, Memory_Usage, Bandwidth_Utilization,
     1 - WARNING
     2 - CRITICAL
     """
-    # Load the trained model and scaler
-    model = joblib.load('../Models/Model.joblib')
-    scaler = joblib.load('../Models/Scaler.joblib')
-
     # Create input array in the correct order
     input_features = [
         CPU_Utilization,
@@ -35,11 +67,104 @@ def predict(CPU_Utilization, Memory_Usage, Bandwidth_Utilization,
         Network_Traffic_Volume
     ]
 
-    # Reshape and scale the input
-    input_reshaped = [input_features]
-    scaled_input = scaler.transform(input_reshaped)
-
-    # Make prediction
-    prediction = model.predict(scaled_input)
+    # Reshape and predict
+    prediction = predict_batch([input_features])
     
-    return int(prediction[0])  # Ensure integer output (0, 1, or 2)
\ No newline at end of file
+    return int(prediction[0])  # Ensure integer output (0, 1, or 2)
+
+def get_current_version(models_dir=MODELS_DIR):
+    """
+    Name of the published model version, or None to use the bundled artifacts
+    """
+    try:
+        with open(os.path.join(models_dir, 'CURRENT'), 'r') as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+def load_model(variant=None):
+    """
+    Return the (model, scaler) pair, reloading only when a new version is published.
+    Checking the CURRENT pointer is a small file read, so a retrained model is
+    picked up by the running app without a restart.
+    A named variant (see src.variants), given here or via MODEL_VARIANT, is loaded
+    from Models/variants/<name>/ instead.
+    """
+    import joblib  # deferred with sklearn until a prediction is actually needed
+
+    variant = variant or os.getenv('MODEL_VARIANT') or None
+    if variant is not None:
+        version = variant
+        model_dir = os.path.join(MODELS_DIR, 'variants', variant)
+    else:
+        version = get_current_version()
+        if version is None:
+            model_dir = MODELS_DIR
+        else:
+            model_dir = os.path.join(MODELS_DIR, 'versions', version)
+
+    with _loaded_lock:
+        loaded = _loaded.get(variant)
+        if loaded is None or loaded[0] != version:
+            with timer('model_load_seconds', variant=variant or 'default'):
+                loaded = (version,
+                          joblib.load(os.path.join(model_dir, 'Model.joblib')),
+                          joblib.load(os.path.join(model_dir, 'Scaler.joblib')))
+            _loaded[variant] = loaded
+        return loaded[1], loaded[2]
+
+def predict_batch(features, variant=None):
+    """
+    Predict system status for an (n, 14) array of rows in FEATURE_NAMES order
+    """
+    model, scaler = load_model(variant)
+    features = np.asarray(features, dtype=np.float64)
+    if DRIFT_MONITOR_ENABLED:
+        get_drift_monitor(scaler).observe(features)
+    with timer('predict_stage_seconds', stage='scaler_transform'):
+        scaled_input = scaler.transform(features)
+    with timer('predict_stage_seconds', stage='model_predict'):
+        return model.predict(scaled_input).astype(int)
+
+def get_drift_monitor(scaler=None):
+    """
+    Drift monitor for the given scaler's training statistics (the default model's if omitted).
+    A new monitor is started whenever a different scaler is published.
+    """
+    if scaler is None:
+        scaler = load_model()[1]
+    with _loaded_lock:
+        if _drift['scaler'] is not scaler:
+            _drift['monitor'] = DriftMonitor(FEATURE_NAMES, scaler.mean_, scaler.var_)
+            _drift['scaler'] = scaler
+        return _drift['monitor']
+
+def explain_batch(features, predictions=None, variant=None):
+    """
+    Per-feature contributions, shape (n, 14), to each row's predicted class probability
+    (or to the given class labels). Rows whose label the model doesn't know (e.g. a
+    version trained without CRITICAL examples) are all NaN. Returns None for models that
+    aren't tree forests.
+    """
+    model, scaler = load_model(variant)
+    if not is_explainable(model):
+        return None
+    with _loaded_lock:
+        if _explainer['model'] is not model:
+            _explainer['explainer'] = ForestExplainer(model)
+            _explainer['model'] = model
+        explainer = _explainer['explainer']
+
+    features = np.asarray(features, dtype=np.float64)
+    with timer('predict_stage_seconds', stage='attribution'):
+        bias, contributions = explainer.explain(scaler.transform(features))
+    if predictions is None:
+        class_index = np.argmax(bias + contributions.sum(axis=1), axis=1)
+    else:
+        predictions = np.asarray(predictions)
+        known = np.isin(predictions, explainer.classes)
+        class_index = np.searchsorted(explainer.classes, np.where(known, predictions, explainer.classes[0]))
+    result = contributions[np.arange(len(features)), :, class_index]
+    if predictions is not None:
+        result[~known] = np.nan
+    return result
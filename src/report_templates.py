@@ -0,0 +1,123 @@
+import string
+from datetime import datetime
+from functools import lru_cache
+import numpy as np
+from src.model import FEATURE_NAMES
+from src.rules import COMPILED_RULES, evaluate_rules, issues_for, remediations_for
+
+REPORT_TEMPLATE = """System Status Report - {timestamp}
+
+Overall Status: {prediction}
+
+Network Performance Metrics:
+- Bandwidth Utilization: {Bandwidth_Utilization}%
+- Throughput: {Throughput} Mbps
+- Latency: {Latency} ms
+- Jitter: {Jitter} ms
+- Packet Loss: {Packet_Loss}%
+- Network Availability: {Network_Availability}%
+
+System Resource Metrics:
+- CPU Utilization: {CPU_Utilization}%
+- Memory Usage: {Memory_Usage}%
+- Grid Voltage: {Grid_Voltage} V
+- Cooling Temperature: {Cooling_Temperature}°C
+
+Network Traffic Analysis:
+- Network Traffic Volume: {Network_Traffic_Volume} Mbps
+- Error Rates: {Error_Rates}
+- Transmission Delay: {Transmission_Delay} ms
+- Connection Establishment/Termination Times: {Connection_Establishment_Termination_Times} ms
+
+System Diagnosis:
+- {diagnosis}
+
+Recommended Actions:
+{remediation}
+"""
+
+NO_ISSUES_TEXT = "No significant issues detected."
+NO_ACTIONS_TEXT = "No immediate actions required. Continue regular monitoring."
+
+def compile_template(template):
+    """
+    Rewrite a named-field template as a positional format string.
+    Returns (format_string, field_names) so rows can be rendered with format(*values).
+    """
+    fields = []
+    parts = []
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        parts.append(literal.replace('{', '{{').replace('}', '}}'))
+        if field is not None:
+            if field not in fields:
+                fields.append(field)
+            conversion = f"!{conversion}" if conversion else ""
+            spec = f":{spec}" if spec else ""
+            parts.append(f"{{{fields.index(field)}{conversion}{spec}}}")
+    return "".join(parts), fields
+
+REPORT_FORMAT, REPORT_FIELDS = compile_template(REPORT_TEMPLATE)
+
+_RULE_BITS = 1 << np.arange(len(COMPILED_RULES['rules']), dtype=np.int64)
+
+@lru_cache(maxsize=None)
+def diagnosis_sections(mask_bits):
+    """
+    Diagnosis and remediation text for one combination of fired rules, keyed by bitmask
+    """
+    mask_row = (mask_bits & _RULE_BITS) != 0
+    issues = issues_for(mask_row)
+    remediations = remediations_for(mask_row)
+    diagnosis = "\n- ".join(issues) if issues else NO_ISSUES_TEXT
+    remediation = "\n\n".join(remediations) if remediations else NO_ACTIONS_TEXT
+    return diagnosis, remediation
+
+def mask_to_bits(rule_mask):
+    """
+    Pack each row of a rule mask into an integer key
+    """
+    return np.atleast_2d(rule_mask).astype(np.int64) @ _RULE_BITS
+
+@lru_cache(maxsize=1024)
+def _mask_bits_for(values):
+    # Only the rule evaluation is shared across sessions; equal values fire the same
+    # rules whether they arrive as int or float, so 1 and 1.0 may share an entry
+    return int(mask_to_bits(evaluate_rules(dict(zip(FEATURE_NAMES, values))))[0])
+
+def render_report(input_data, prediction):
+    """
+    Render a single report stamped with the current time.
+    Rule evaluation is memoized per input vector; values are formatted as given.
+    """
+    values = tuple(input_data[name] for name in FEATURE_NAMES)
+    row = dict(zip(FEATURE_NAMES, values))
+    row['diagnosis'], row['remediation'] = diagnosis_sections(_mask_bits_for(values))
+    row['timestamp'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    row['prediction'] = prediction
+    return REPORT_FORMAT.format(*(row[field] for field in REPORT_FIELDS))
+
+def render_reports(data, predictions, timestamp=None):
+    """
+    Render reports for a chunk of rows (DataFrame or list of dicts) in one pass.
+    predictions is a single status or one status per row.
+    """
+    if timestamp is None:
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    if hasattr(data, 'columns'):
+        columns = {name: data[name].tolist() for name in FEATURE_NAMES}
+    else:
+        columns = {name: [row[name] for row in data] for name in FEATURE_NAMES}
+    n_rows = len(columns[FEATURE_NAMES[0]])
+    if isinstance(predictions, str):
+        predictions = [predictions] * n_rows
+
+    # Rules run vectorized over the chunk; each distinct combination of fired rules
+    # is rendered to text only once
+    sections = [diagnosis_sections(int(bits)) for bits in mask_to_bits(evaluate_rules(data))]
+    columns['diagnosis'] = [section[0] for section in sections]
+    columns['remediation'] = [section[1] for section in sections]
+    columns['timestamp'] = [timestamp] * n_rows
+    columns['prediction'] = list(predictions)
+
+    ordered = [columns[field] for field in REPORT_FIELDS]
+    return [REPORT_FORMAT.format(*row) for row in zip(*ordered)]
@@ -0,0 +1,106 @@
+import numpy as np
+from src.model import FEATURE_NAMES
+
+# Threshold rules shared by report diagnosis, remediation suggestions and the Q&A prompt.
+# Each rule: (feature, operator, threshold, diagnosis, remediation)
+THRESHOLD_RULES = [
+    ('CPU_Utilization', '>=', 80,
+     "High CPU utilization indicating system overload",
+     "- Identify and terminate resource-intensive processes\n- Consider upgrading CPU capacity\n- Implement better load balancing"),
+    ('Memory_Usage', '>=', 80,
+     "Elevated memory usage suggesting resource constraints",
+     "- Clear system cache\n- Optimize memory-intensive applications\n- Consider increasing RAM capacity"),
+    ('Error_Rates', '>=', 5,
+     "High error rates detected indicating potential system issues",
+     "- Review system logs for error patterns\n- Update system dependencies\n- Implement error tracking and monitoring"),
+    ('Network_Traffic_Volume', '>', 1000,  # Assuming 1000 Mbps threshold
+     "Excessive network traffic detected suggesting potential network congestion",
+     "- Review network traffic patterns\n- Implement traffic shaping\n- Consider bandwidth upgrade"),
+    ('Cooling_Temperature', '>', 30,
+     "Elevated cooling temperature indicating potential cooling system issues",
+     "- Check cooling system functionality\n- Ensure proper ventilation\n- Monitor temperature trends"),
+    ('Bandwidth_Utilization', '>', 90,
+     "High bandwidth utilization indicating potential network bottleneck",
+     "- Analyze bandwidth consumption patterns\n- Implement QoS policies\n- Consider bandwidth optimization techniques"),
+    ('Latency', '>', 100,  # Assuming 100ms threshold
+     "High network latency detected affecting system performance",
+     "- Check network connectivity\n- Identify network bottlenecks\n- Optimize network routing"),
+    ('Packet_Loss', '>', 2,  # Assuming 2% threshold
+     "Significant packet loss detected affecting network reliability",
+     "- Investigate network connectivity issues\n- Check for network congestion\n- Verify network hardware functionality"),
+    ('Jitter', '>', 30,  # Assuming 30ms threshold
+     "High jitter levels affecting network stability",
+     "- Monitor network stability\n- Implement jitter buffering\n- Check for network interference"),
+    ('Network_Availability', '<', 99,  # Assuming 99% threshold
+     "Reduced network availability affecting system reliability",
+     "- Review network infrastructure\n- Implement redundancy measures\n- Check for single points of failure"),
+    ('Transmission_Delay', '>', 200,  # Assuming 200ms threshold
+     "High transmission delay affecting data transfer efficiency",
+     "- Optimize data transmission paths\n- Review network topology\n- Consider content delivery optimization"),
+    ('Connection_Establishment_Termination_Times', '>', 1000,  # Assuming 1000ms threshold
+     "Slow connection establishment/termination affecting session handling",
+     "- Check connection pooling settings\n- Optimize connection handling\n- Review connection timeout parameters"),
+]
+
+_OPERATORS = {'>': np.greater, '>=': np.greater_equal, '<': np.less, '<=': np.less_equal}
+
+def compile_rules(rules):
+    """
+    Compile a rule table into column indices, thresholds and per-operator groups
+    so a whole batch is evaluated with one comparison per operator
+    """
+    feature_index = np.array([FEATURE_NAMES.index(rule[0]) for rule in rules], dtype=np.intp)
+    thresholds = np.array([rule[2] for rule in rules], dtype=np.float64)
+    groups = []
+    for op, ufunc in _OPERATORS.items():
+        positions = np.array([i for i, rule in enumerate(rules) if rule[1] == op], dtype=np.intp)
+        if len(positions):
+            groups.append((ufunc, positions, feature_index[positions], thresholds[positions]))
+    return {
+        'rules': rules,
+        'groups': groups,
+        'diagnoses': [rule[3] for rule in rules],
+        'remediations': [rule[4] for rule in rules],
+    }
+
+COMPILED_RULES = compile_rules(THRESHOLD_RULES)
+
+def to_feature_matrix(data):
+    """
+    Convert a single input dict, a list of dicts or a DataFrame into an (n, 14) float array
+    """
+    if isinstance(data, dict):
+        return np.array([[data[name] for name in FEATURE_NAMES]], dtype=np.float64)
+    if hasattr(data, 'columns'):
+        return data[FEATURE_NAMES].to_numpy(dtype=np.float64)
+    if isinstance(data, np.ndarray):
+        return np.atleast_2d(data).astype(np.float64, copy=False)
+    return np.array([[row[name] for name in FEATURE_NAMES] for row in data], dtype=np.float64)
+
+def evaluate_rules(data, compiled=COMPILED_RULES):
+    """
+    Return an (n, n_rules) boolean mask of which rules fire for each row
+    """
+    X = to_feature_matrix(data)
+    mask = np.zeros((X.shape[0], len(compiled['rules'])), dtype=bool)
+    for ufunc, positions, columns, thresholds in compiled['groups']:
+        mask[:, positions] = ufunc(X[:, columns], thresholds)
+    return mask
+
+def issues_for(mask_row, compiled=COMPILED_RULES):
+    """
+    Diagnosis lines for the rules that fired in one row of the mask
+    """
+    return [compiled['diagnoses'][i] for i in np.flatnonzero(mask_row)]
+
+def remediations_for(mask_row, compiled=COMPILED_RULES):
+    """
+    Remediation blocks for the rules that fired in one row of the mask
+    """
+    return [compiled['remediations'][i] for i in np.flatnonzero(mask_row)]
+
+def describe_rules(rules=THRESHOLD_RULES):
+    """
+    Human-readable list of the abnormal-state conditions, for LLM prompts
+    """
+    return "\n".join(f"- {rule[0].replace('_', ' ')} {rule[1]} {rule[2]}" for rule in rules)
@@ -0,0 +1,56 @@
+"""
+Report per-module import time for the app's entry points using `python -X importtime`.
+
+Usage (from the repository root):
+    python -m src.startup_profile
+    python -m src.startup_profile --module src.main --top 30
+"""
+import argparse
+import re
+import subprocess
+import sys
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+def profile_imports(module):
+    """
+    Import `module` in a fresh interpreter and return (total_us, rows), where rows are
+    (package, self_us) summed over each top-level package's modules, slowest first
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+
+    packages = {}
+    total = 0
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = int(match[1]), int(match[2]), match[3], match[4]
+        package = name.split('.')[0]
+        packages[package] = packages.get(package, 0) + self_us
+        # Only outermost imports add their cumulative time, so nothing is counted twice
+        if len(indent) == 1:
+            total += cumulative_us
+
+    rows = sorted(packages.items(), key=lambda row: row[1], reverse=True)
+    return total, rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-package import time for the app's entry points")
+    parser.add_argument('--module', action='append',
+                        help="Module to profile (repeatable); defaults to src.login and src.main")
+    parser.add_argument('--top', type=int, default=15, help="Number of packages to list per module")
+    args = parser.parse_args()
+
+    for module in args.module or ['src.login', 'src.main']:
+        total, rows = profile_imports(module)
+        print(f"\n{module}: {total / 1000:.1f} ms total import time")
+        print(f"{'package':<32} {'self ms':>9}")
+        for package, self_us in rows[:args.top]:
+            print(f"{package:<32} {self_us / 1000:>9.1f}")
+
+if __name__ == "__main__":
+    main()
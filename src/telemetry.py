@@ -0,0 +1,227 @@
+import json
+import os
+import random
+import socket
+import sqlite3
+import time
+from collections import deque
+from datetime import datetime
+import numpy as np
+from src.model import FEATURE_NAMES, STATUS_NAMES, predict_batch
+from src.report_templates import render_report
+from src.db_cache import bump_generation
+
+# Samples are JSON objects with a "host" key plus the 14 metric names used by the model,
+# e.g. {"host": "edge-01", "CPU_Utilization": 42, ..., "Network_Traffic_Volume": 120.5}
+
+class RingBuffer:
+    """
+    Fixed-size store for the last `capacity` samples of one host.
+    Appends overwrite the oldest slot, so memory is bounded and each sample is O(1).
+    """
+
+    def __init__(self, capacity, n_features=len(FEATURE_NAMES)):
+        self.capacity = capacity
+        self.values = np.zeros((capacity, n_features), dtype=np.float64)
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.statuses = np.zeros(capacity, dtype=np.int8)
+        self.next_index = 0
+        self.count = 0
+
+    def append(self, timestamp, values, status):
+        self.values[self.next_index] = values
+        self.timestamps[self.next_index] = timestamp
+        self.statuses[self.next_index] = status
+        self.next_index = (self.next_index + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def ordered(self):
+        """
+        Return (timestamps, values, statuses) oldest first
+        """
+        if self.count < self.capacity:
+            window = slice(0, self.count)
+            return self.timestamps[window], self.values[window], self.statuses[window]
+        order = np.r_[self.next_index:self.capacity, 0:self.next_index]
+        return self.timestamps[order], self.values[order], self.statuses[order]
+
+    def latest(self):
+        if self.count == 0:
+            return None
+        index = (self.next_index - 1) % self.capacity
+        return self.timestamps[index], self.values[index], int(self.statuses[index])
+
+def parse_sample(line):
+    """
+    Parse one JSON sample line; returns None for blank or malformed lines
+    """
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        sample = json.loads(line)
+        return {'host': str(sample.get('host', 'default')),
+                **{name: float(sample[name]) for name in FEATURE_NAMES}}
+    except (ValueError, KeyError, TypeError) as e:
+        print(f"Skipping malformed telemetry sample: {e}")
+        return None
+
+class StubSource:
+    """
+    Random-walk metric generator for demos and local testing
+    """
+
+    def __init__(self, hosts=("edge-01", "edge-02", "core-01"), samples_per_poll=1):
+        self.samples_per_poll = samples_per_poll
+        self.state = {host: {
+            'CPU_Utilization': 50.0, 'Memory_Usage': 55.0, 'Bandwidth_Utilization': 50.0,
+            'Throughput': 45.0, 'Latency': 35.0, 'Jitter': 3.0, 'Packet_Loss': 1.0,
+            'Error_Rates': 3.0, 'Connection_Establishment_Termination_Times': 175.0,
+            'Network_Availability': 88.0, 'Transmission_Delay': 5.5, 'Grid_Voltage': 118.0,
+            'Cooling_Temperature': 65.0, 'Network_Traffic_Volume': 55.0,
+        } for host in hosts}
+
+    def poll(self):
+        samples = []
+        for _ in range(self.samples_per_poll):
+            for host, metrics in self.state.items():
+                for name, value in metrics.items():
+                    metrics[name] = max(0.0, value * (1 + random.gauss(0, 0.03)))
+                metrics['Network_Availability'] = min(metrics['Network_Availability'], 100.0)
+                samples.append({'host': host, **metrics})
+        return samples
+
+    def close(self):
+        pass
+
+class FileTailSource:
+    """
+    Follow a JSON-lines file, returning only lines appended since the last poll
+    """
+
+    def __init__(self, path, from_start=False):
+        self.path = path
+        self.offset = 0 if from_start or not os.path.exists(path) else os.path.getsize(path)
+        self.partial = ""
+
+    def poll(self):
+        if not os.path.exists(self.path):
+            return []
+        if os.path.getsize(self.path) < self.offset:
+            # File was truncated or rotated; start over
+            self.offset = 0
+            self.partial = ""
+        with open(self.path, "r") as f:
+            f.seek(self.offset)
+            data = f.read()
+            self.offset = f.tell()
+        lines = (self.partial + data).split("\n")
+        self.partial = lines.pop()  # keep an incomplete trailing line for the next poll
+        return [sample for sample in map(parse_sample, lines) if sample is not None]
+
+    def close(self):
+        pass
+
+class UDPSource:
+    """
+    Receive JSON-lines datagrams on a local UDP port without blocking
+    """
+
+    def __init__(self, port, host="127.0.0.1", max_datagrams=1000):
+        self.max_datagrams = max_datagrams
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((host, port))
+        self.sock.setblocking(False)
+
+    def poll(self):
+        samples = []
+        for _ in range(self.max_datagrams):
+            try:
+                data, _ = self.sock.recvfrom(65535)
+            except BlockingIOError:
+                break
+            for line in data.decode("utf-8", errors="replace").split("\n"):
+                sample = parse_sample(line)
+                if sample is not None:
+                    samples.append(sample)
+        return samples
+
+    def close(self):
+        self.sock.close()
+
+class TelemetryMonitor:
+    """
+    Classifies incoming samples, keeps a ring buffer per host and persists
+    only state transitions to the reports table. A host's first sample sets its
+    baseline state and is not a transition.
+    """
+
+    def __init__(self, capacity=600, db_path='system_reports.db', persist=True, max_transitions=200):
+        self.capacity = capacity
+        self.db_path = db_path
+        self.persist = persist
+        self.buffers = {}
+        self.last_status = {}
+        self.transitions = deque(maxlen=max_transitions)
+        self.samples_seen = 0
+
+    def ingest(self, samples):
+        """
+        Classify a batch of samples with one model call and record them
+        """
+        if not samples:
+            return []
+        now = time.time()
+        X = np.array([[sample[name] for name in FEATURE_NAMES] for sample in samples], dtype=np.float64)
+        predictions = predict_batch(X)
+
+        transitions = []
+        for sample, values, status in zip(samples, X, predictions):
+            host = sample['host']
+            buffer = self.buffers.get(host)
+            if buffer is None:
+                buffer = self.buffers[host] = RingBuffer(self.capacity)
+            buffer.append(now, values, status)
+
+            previous = self.last_status.get(host)
+            if previous != status:
+                self.last_status[host] = status
+                if previous is not None:
+                    transitions.append((host, sample, int(previous), int(status)))
+        self.samples_seen += len(samples)
+
+        if transitions:
+            self.transitions.extend(transitions)
+            if self.persist:
+                save_transitions(transitions, self.db_path)
+        return transitions
+
+def save_transitions(transitions, db_path='system_reports.db'):
+    """
+    Store one report row per host state change
+    """
+    conn = sqlite3.connect(db_path)
+    c = conn.cursor()
+    try:
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        rows = []
+        for host, sample, previous, status in transitions:
+            status_name = STATUS_NAMES.get(status, "UNKNOWN")
+            previous_name = STATUS_NAMES.get(previous, "NONE") if previous is not None else "NONE"
+            # The transition note goes in the report text; feedback is left for operators,
+            # so these rows are never sent for issue classification
+            report_text = (f"Live telemetry: {host} changed from {previous_name} to {status_name}\n\n"
+                           + render_report(sample, status_name))
+            rows.append((f"live:{host}", timestamp,
+                         *[sample[name] for name in FEATURE_NAMES],
+                         status_name, report_text))
+        c.executemany(f'''INSERT INTO reports
+                     (username, Date_and_Time, {", ".join(FEATURE_NAMES)},
+                      System_State, report_text)
+                     VALUES ({", ".join("?" * (len(FEATURE_NAMES) + 4))})''', rows)
+        bump_generation(c)
+        conn.commit()
+    except sqlite3.Error as e:
+        print(f"Database error: {e}")
+    finally:
+        conn.close()
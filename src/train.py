@@ -0,0 +1,188 @@
+"""
+Retrain the system status model from labelled rows in the reports database.
+
+Usage (from the src directory, like the app; PYTHONPATH=.. makes the src package importable):
+    PYTHONPATH=.. python -m src.train --db system_reports.db
+    PYTHONPATH=.. python -m src.train --db system_reports.db --benchmark 1000 10000 100000
+"""
+import argparse
+import json
+import os
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+from datetime import datetime
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+from src.model import FEATURE_NAMES, STATUS_NAMES, MODELS_DIR
+
+STATUS_CODES = {name: code for code, name in STATUS_NAMES.items()}
+
+# Defaults match the shipped Models/Model.joblib
+FOREST_PARAMS = {'n_estimators': 349, 'max_depth': 12, 'max_features': 'sqrt'}
+
+def iter_training_chunks(db_path='system_reports.db', chunksize=50000):
+    """
+    Yield (X, y) arrays chunk by chunk so the reports table is never loaded as one DataFrame
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        query = f"""SELECT {", ".join(FEATURE_NAMES)}, System_State FROM reports
+                    WHERE System_State IN ('NORMAL', 'WARNING', 'CRITICAL')"""
+        for chunk in pd.read_sql_query(query, conn, chunksize=chunksize):
+            chunk = chunk.dropna()
+            X = chunk[FEATURE_NAMES].to_numpy(dtype=np.float32)
+            y = chunk['System_State'].map(STATUS_CODES).to_numpy(dtype=np.int8)
+            yield X, y
+    finally:
+        conn.close()
+
+def load_training_arrays(db_path='system_reports.db', chunksize=50000):
+    """
+    Stream chunks into compact float32 arrays (56 bytes per row)
+    """
+    X_parts, y_parts = [], []
+    for X, y in iter_training_chunks(db_path, chunksize):
+        X_parts.append(X)
+        y_parts.append(y)
+    if not X_parts:
+        return np.empty((0, len(FEATURE_NAMES)), dtype=np.float32), np.empty(0, dtype=np.int8)
+    return np.concatenate(X_parts), np.concatenate(y_parts)
+
+def train_model(X, y, n_jobs=-1, test_size=0.2, random_state=42, forest_params=None):
+    """
+    Fit the scaler and forest on a train split and score on the held-out split.
+    Returns (model, scaler, metrics).
+    """
+    if len(np.unique(y)) < 2:
+        raise ValueError("Need labelled reports from at least two system states to train")
+
+    stratify = y if np.bincount(y).min() >= 2 else None
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=test_size, random_state=random_state, stratify=stratify)
+
+    start = time.perf_counter()
+    scaler = StandardScaler()
+    X_train = scaler.fit_transform(X_train)
+    model = RandomForestClassifier(n_jobs=n_jobs, random_state=random_state,
+                                   **(forest_params or FOREST_PARAMS))
+    model.fit(X_train, y_train)
+    training_time = time.perf_counter() - start
+    # Predictions are mostly single rows, where a thread pool costs more than it saves
+    model.set_params(n_jobs=None)
+
+    accuracy = accuracy_score(y_test, model.predict(scaler.transform(X_test)))
+    metrics = {
+        'accuracy': float(accuracy),
+        'training_time_seconds': training_time,
+        'train_rows': int(len(y_train)),
+        'test_rows': int(len(y_test)),
+    }
+    return model, scaler, metrics
+
+def save_version(model, scaler, metrics, models_dir=MODELS_DIR, extra_metadata=None):
+    """
+    Write a new versioned artifact directory and return its version name
+    """
+    # Runs started in the same second get a numeric suffix instead of colliding
+    base_version = datetime.now().strftime("%Y%m%d-%H%M%S")
+    version, suffix = base_version, 1
+    while True:
+        version_dir = os.path.join(models_dir, 'versions', version)
+        try:
+            os.makedirs(version_dir, exist_ok=False)
+            break
+        except FileExistsError:
+            suffix += 1
+            version = f"{base_version}-{suffix}"
+
+    joblib.dump(model, os.path.join(version_dir, 'Model.joblib'))
+    joblib.dump(scaler, os.path.join(version_dir, 'Scaler.joblib'))
+    metadata = {
+        'version': version,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'feature_order': FEATURE_NAMES,
+        'classes': {int(code): STATUS_NAMES[int(code)] for code in model.classes_},
+        'scaler_mean': scaler.mean_.tolist(),
+        'scaler_var': scaler.var_.tolist(),
+        'model_params': {key: value for key, value in model.get_params().items()
+                         if isinstance(value, (int, float, str, bool, type(None)))},
+        **metrics,
+        **(extra_metadata or {}),
+    }
+    with open(os.path.join(version_dir, 'metadata.json'), 'w') as f:
+        json.dump(metadata, f, indent=4)
+    return version
+
+def publish_version(version, models_dir=MODELS_DIR):
+    """
+    Atomically point CURRENT at a version; the running predictor reloads on its next call
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=models_dir, prefix='.CURRENT.')
+    with os.fdopen(fd, 'w') as f:
+        f.write(version)
+    os.replace(tmp_path, os.path.join(models_dir, 'CURRENT'))
+
+def benchmark_training(X, y, sizes, n_jobs=-1):
+    """
+    Measure training time and peak memory for growing dataset sizes.
+    peak_memory_mb counts Python/NumPy allocations; peak_rss_mb is the process high-water
+    mark, which also covers the trees built in native code (run sizes in ascending order).
+    Sizes larger than the available data are reached by resampling rows with replacement.
+    """
+    rng = np.random.default_rng(0)
+    results = []
+    for size in sizes:
+        rows = rng.choice(len(y), size=size, replace=size > len(y))
+        tracemalloc.start()
+        _, _, metrics = train_model(X[rows], y[rows], n_jobs=n_jobs)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 if resource else float('nan')
+        results.append({'rows': size, 'training_time_seconds': metrics['training_time_seconds'],
+                        'peak_memory_mb': peak / 1e6, 'peak_rss_mb': peak_rss,
+                        'accuracy': metrics['accuracy']})
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Retrain the system status model from the reports database")
+    parser.add_argument('--db', default='system_reports.db', help="SQLite database with the reports table")
+    parser.add_argument('--models-dir', default=MODELS_DIR, help="Directory holding Model.joblib and versions/")
+    parser.add_argument('--chunksize', type=int, default=50000, help="Rows read from the database per chunk")
+    parser.add_argument('--n-jobs', type=int, default=-1, help="Cores used to build trees (-1 for all)")
+    parser.add_argument('--no-publish', action='store_true', help="Write the version without making it current")
+    parser.add_argument('--benchmark', type=int, nargs='+', metavar='ROWS',
+                        help="Report training time and peak memory for these dataset sizes instead of training")
+    args = parser.parse_args()
+
+    X, y = load_training_arrays(args.db, args.chunksize)
+    print(f"Loaded {len(y)} labelled rows from {args.db}")
+
+    if args.benchmark:
+        print(f"{'rows':>10} {'time (s)':>10} {'peak MB':>10} {'peak RSS MB':>12} {'accuracy':>10}")
+        for result in benchmark_training(X, y, sorted(args.benchmark), args.n_jobs):
+            print(f"{result['rows']:>10} {result['training_time_seconds']:>10.2f} "
+                  f"{result['peak_memory_mb']:>10.1f} {result['peak_rss_mb']:>12.1f} "
+                  f"{result['accuracy']:>10.3f}")
+        return
+
+    model, scaler, metrics = train_model(X, y, n_jobs=args.n_jobs)
+    version = save_version(model, scaler, metrics, args.models_dir)
+    print(f"Trained version {version}: accuracy {metrics['accuracy']:.3f} "
+          f"in {metrics['training_time_seconds']:.2f}s")
+    if not args.no_publish:
+        publish_version(version, args.models_dir)
+        print(f"Published {version}")
+
+if __name__ == "__main__":
+    main()
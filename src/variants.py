@@ -0,0 +1,168 @@
+"""
+Build compact alternatives to the shipped forest and benchmark them against it.
+
+Usage (from the src directory, like the app; PYTHONPATH=.. makes the src package importable):
+    PYTHONPATH=.. python -m src.variants --db system_reports.db --accuracy-floor 0.95
+
+Each variant is saved to Models/variants/<name>/ and can be served by setting
+MODEL_VARIANT=<name> (or passing variant= to src.model.load_model / predict_batch).
+"""
+import argparse
+import io
+import json
+import os
+import pickle
+import time
+import tracemalloc
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+from src.model import MODELS_DIR, get_current_version
+from src.train import load_training_arrays
+
+VARIANTS = {
+    'forest_limited': lambda n_jobs: RandomForestClassifier(
+        n_estimators=100, max_depth=8, max_leaf_nodes=64, n_jobs=n_jobs, random_state=42),
+    'forest_small': lambda n_jobs: RandomForestClassifier(
+        n_estimators=25, max_depth=12, n_jobs=n_jobs, random_state=42),
+    'hist_gradient_boosting': lambda n_jobs: HistGradientBoostingClassifier(
+        max_iter=100, max_leaf_nodes=15, random_state=42),
+}
+
+def measure_loaded_memory(model):
+    """
+    Peak Python/NumPy allocation while loading the model from its joblib form, in bytes.
+    This is the memory a worker pays to hold the model, unlike the pickled size on disk.
+    """
+    buffer = io.BytesIO()
+    joblib.dump(model, buffer)
+    buffer.seek(0)
+    tracemalloc.start()
+    try:
+        joblib.load(buffer)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+def measure_model(model, scaler, X_test, y_test, latency_samples=200):
+    """
+    Accuracy, pickled size, loaded memory, single-row latency and batch throughput for one model
+    """
+    accuracy = accuracy_score(y_test, model.predict(scaler.transform(X_test)))
+
+    single_row_times = []
+    for row in X_test[:latency_samples]:
+        start = time.perf_counter()
+        model.predict(scaler.transform(row.reshape(1, -1)))
+        single_row_times.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    model.predict(scaler.transform(X_test))
+    batch_time = time.perf_counter() - start
+
+    return {
+        'accuracy': float(accuracy),
+        'pickle_kb': len(pickle.dumps(model)) / 1024,
+        'memory_kb': measure_loaded_memory(model) / 1024,
+        'latency_p50_ms': float(np.percentile(single_row_times, 50) * 1000),
+        'latency_p95_ms': float(np.percentile(single_row_times, 95) * 1000),
+        'batch_rows_per_second': len(X_test) / batch_time if batch_time > 0 else float('inf'),
+    }
+
+def load_current_model(models_dir=MODELS_DIR):
+    """
+    The default model in models_dir (its published version, else the bundled files),
+    regardless of any MODEL_VARIANT in the environment
+    """
+    version = get_current_version(models_dir)
+    model_dir = models_dir if version is None else os.path.join(models_dir, 'versions', version)
+    return (joblib.load(os.path.join(model_dir, 'Model.joblib')),
+            joblib.load(os.path.join(model_dir, 'Scaler.joblib')))
+
+def build_variants(X, y, n_jobs=-1, models_dir=MODELS_DIR, names=None):
+    """
+    Train each variant on a shared split, save it, and benchmark it alongside the current model.
+    Returns a list of result dicts, the current model first.
+    """
+    if len(np.unique(y)) < 2:
+        raise ValueError("Need labelled reports from at least two system states to compare variants")
+
+    stratify = y if np.bincount(y).min() >= 2 else None
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42, stratify=stratify)
+
+    model, scaler = load_current_model(models_dir)
+    results = [{'name': 'current', **measure_model(model, scaler, X_test, y_test)}]
+
+    scaler = StandardScaler().fit(X_train)
+    X_train_scaled = scaler.transform(X_train)
+    for name in names or VARIANTS:
+        start = time.perf_counter()
+        model = VARIANTS[name](n_jobs)
+        model.fit(X_train_scaled, y_train)
+        training_time = time.perf_counter() - start
+        if 'n_jobs' in model.get_params():
+            model.set_params(n_jobs=None)
+
+        metrics = measure_model(model, scaler, X_test, y_test)
+        metrics['training_time_seconds'] = training_time
+
+        variant_dir = os.path.join(models_dir, 'variants', name)
+        os.makedirs(variant_dir, exist_ok=True)
+        joblib.dump(model, os.path.join(variant_dir, 'Model.joblib'))
+        joblib.dump(scaler, os.path.join(variant_dir, 'Scaler.joblib'))
+        with open(os.path.join(variant_dir, 'metadata.json'), 'w') as f:
+            json.dump({'variant': name, 'estimator': type(model).__name__, **metrics}, f, indent=4)
+
+        results.append({'name': name, **metrics})
+    return results
+
+def select_variant(results, accuracy_floor):
+    """
+    Cheapest model (lowest single-row p50 latency) whose accuracy meets the floor, or None
+    """
+    eligible = [result for result in results if result['accuracy'] >= accuracy_floor]
+    if not eligible:
+        return None
+    return min(eligible, key=lambda result: (result['latency_p50_ms'], result['memory_kb']))
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and benchmark compact model variants")
+    parser.add_argument('--db', default='system_reports.db', help="SQLite database with the reports table")
+    parser.add_argument('--models-dir', default=MODELS_DIR, help="Directory to write variants/ under")
+    parser.add_argument('--n-jobs', type=int, default=-1, help="Cores used while training forests")
+    parser.add_argument('--variants', nargs='+', choices=sorted(VARIANTS), help="Subset of variants to build")
+    parser.add_argument('--accuracy-floor', type=float, default=0.95,
+                        help="Minimum held-out accuracy when recommending a variant")
+    args = parser.parse_args()
+
+    X, y = load_training_arrays(args.db)
+    print(f"Loaded {len(y)} labelled rows from {args.db}")
+    try:
+        results = build_variants(X, y, args.n_jobs, args.models_dir, args.variants)
+    except ValueError as e:
+        print(e)
+        return
+
+    print(f"{'model':<24} {'accuracy':>9} {'pickle KB':>10} {'memory KB':>10} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'rows/s':>10}")
+    for result in results:
+        print(f"{result['name']:<24} {result['accuracy']:>9.3f} {result['pickle_kb']:>10.1f} "
+              f"{result['memory_kb']:>10.1f} "
+              f"{result['latency_p50_ms']:>8.3f} {result['latency_p95_ms']:>8.3f} "
+              f"{result['batch_rows_per_second']:>10.0f}")
+
+    choice = select_variant(results, args.accuracy_floor)
+    if choice is None:
+        print(f"No model reaches an accuracy of {args.accuracy_floor}")
+    elif choice['name'] == 'current':
+        print("The current model is the cheapest one meeting the accuracy floor")
+    else:
+        print(f"Recommended: MODEL_VARIANT={choice['name']}")
+
+if __name__ == "__main__":
+    main()